@@ -0,0 +1,328 @@
+
+"""
+Per-frame cost of the toolbox hot paths, run headless on the SDL dummy drivers.
+
+    python benchmarks/hot_paths.py                            print timings
+    python benchmarks/hot_paths.py --save base.json           store timings as a baseline
+    python benchmarks/hot_paths.py --baseline base.json --threshold 0.25
+    python benchmarks/hot_paths.py --cases render,tick_all --sizes render=100,1000 --sizes tick_all=1000
+
+Each case is parameterized by a population size (sprites, events, timers, ...) and reports the median
+milliseconds per frame over --budget seconds. Exits with 1 if a case is slower than the baseline by more
+than the threshold.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+import toolbox
+
+
+
+FRAME = 1 / 60
+
+
+
+
+
+def render_case(size:int):
+    """
+    Renderer.render of size sprites spread over 4 z layers.
+    """
+
+    rng = random.Random(size)
+
+    display = pygame.Surface((1280, 720))
+    sprites = [pygame.Surface((rng.randint(8, 48), rng.randint(8, 48))) for _ in range(64)]
+
+    layers = [[(rng.choice(sprites), (rng.randint(0, 1280), rng.randint(0, 720))) for _ in range(size // 4)] for _ in range(4)]
+
+    renderer = toolbox.Renderer()
+    renderer.create_queue("bench")
+
+    def frame():
+        for z_layer, items in enumerate(layers):
+            renderer.queue_many("bench", items, z_layer)
+
+        renderer.render(display, "bench")
+
+    return frame
+
+
+
+def poll_case(size:int):
+    """
+    EventManager.poll of size events per frame, dispatched to 8 subscribers over the polled types.
+    """
+
+    rng = random.Random(size)
+
+    kinds = [
+        lambda: pygame.event.Event(pygame.KEYDOWN, key=rng.randint(97, 122), mod=0, unicode="", scancode=0),
+        lambda: pygame.event.Event(pygame.KEYUP, key=rng.randint(97, 122), mod=0, unicode="", scancode=0),
+        lambda: pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(rng.randint(0, 1280), rng.randint(0, 720))),
+        lambda: pygame.event.Event(pygame.MOUSEMOTION, pos=(rng.randint(0, 1280), rng.randint(0, 720)), rel=(1, 1), buttons=(0, 0, 0)),
+    ]
+
+    events = [rng.choice(kinds)() for _ in range(size)]
+
+    manager = toolbox.EventManager(event_source=lambda: events, input_state=toolbox.InputState())
+
+    for index in range(8):
+        manager.subscribe((pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION)[index % 4], lambda event: None, index)
+
+    return manager.poll
+
+
+
+def tick_all_case(size:int):
+    """
+    TimerManager.tick_all over size interval timers with 0.5 to 5 second periods, one frame of virtual time per tick.
+    """
+
+    rng = random.Random(size)
+    clock = toolbox.VirtualClock()
+
+    manager = toolbox.TimerManager(clock=clock)
+
+    for timer_id in range(size):
+        manager.create_interval_timer(timer_id, rng.uniform(0.5, 5), lambda expirations: None, True)
+
+    def frame():
+        clock.advance(FRAME)
+        manager.tick_all()
+
+    return frame
+
+
+
+def idle_gap_case(size:int):
+    """
+    TimerManager.tick_all on a 1 ms timing wheel after size seconds without a tick, as after an idle mode wait,
+    over 100 interval timers with 2 to 8 gap periods.
+    """
+
+    rng = random.Random(size)
+    clock = toolbox.VirtualClock()
+
+    manager = toolbox.TimerManager(toolbox.TimingWheelScheduler(), clock)
+
+    for timer_id in range(100):
+        manager.create_interval_timer(timer_id, rng.uniform(2 * size, 8 * size), lambda expirations: None, True, catch_up="skip")
+
+    def frame():
+        clock.advance(size)
+        manager.tick_all()
+
+    return frame
+
+
+
+def stopwatch_case(size:int):
+    """
+    get_time_elapsed and lap on size running stopwatches.
+    """
+
+    clock = toolbox.FrameClock()
+    manager = toolbox.StopwatchManager(clock)
+
+    for stopwatch_id in range(size):
+        manager.create_new_stopwatch(stopwatch_id, True, max_laps=64)
+
+    stopwatches = list(manager.stopwatches.values())
+
+    def frame():
+        clock.sample()
+
+        for stopwatch in stopwatches:
+            stopwatch.get_time_elapsed()
+            stopwatch.lap()
+
+    return frame
+
+
+
+def zones_case(size:int):
+    """
+    size nested profiling zone entries per frame, plus the end_frame rollup.
+    """
+
+    manager = toolbox.StopwatchManager()
+
+    outer = manager.zone("outer")
+    inner = manager.zone("inner")
+
+    def frame():
+        for _ in range(size):
+            with outer:
+                with inner:
+                    pass
+
+        manager.end_frame()
+
+    return frame
+
+
+
+def game_loop_case(size:int):
+    """
+    Game.run overhead per frame with size empty pre-frame and post-frame updates.
+    """
+
+    game = toolbox.Game(toolbox.VirtualClock())
+
+    for priority in range(size):
+        game.add_pre_frame_update(lambda: None, priority)
+        game.add_post_frame_update(lambda: None, priority)
+
+    frames = 100
+    remaining = [0]
+
+    def stop_after_frames():
+        remaining[0] -= 1
+
+        if not remaining[0]:
+            game._running = False
+
+    game.add_post_frame_update(stop_after_frames, size)
+
+    # one sample covers a batch of frames so the run() entry cost is amortized, reported per frame
+    def frame():
+        remaining[0] = frames
+        game.run()
+
+    frame.frames = frames
+
+    return frame
+
+
+
+# name : (setup, default sizes)
+CASES = {
+    "render": (render_case, (100, 1000, 10000)),
+    "poll": (poll_case, (10, 100, 1000)),
+    "tick_all": (tick_all_case, (1000, 10000, 100000)),
+    "idle_gap": (idle_gap_case, (1, 60, 3600)),
+    "stopwatch": (stopwatch_case, (10, 100, 1000)),
+    "zones": (zones_case, (10, 100, 1000)),
+    "game_loop": (game_loop_case, (1, 10, 100)),
+}
+
+
+
+
+
+def bench(setup, size:int, budget:float, max_samples:int) -> dict[str, float]:
+    """
+    Runs one case for about budget seconds. Returns the median and 90th percentile milliseconds per frame.
+    """
+
+    frame = setup(size)
+    frames = getattr(frame, "frames", 1)
+
+    # warm caches and lazy imports
+    frame()
+
+    samples = []
+    start = time.perf_counter()
+
+    while len(samples) < max_samples:
+        sample_start = time.perf_counter_ns()
+        frame()
+        samples.append((time.perf_counter_ns() - sample_start) / frames / 1e6)
+
+        if time.perf_counter() - start > budget:
+            break
+
+    samples.sort()
+
+    return {
+        "ms": statistics.median(samples),
+        "p90_ms": samples[int(len(samples) * 0.9)] if len(samples) > 1 else samples[0],
+        "samples": len(samples),
+    }
+
+
+
+def parse_sizes(options:list[str] | None) -> dict[str, tuple[int, ...]]:
+
+    sizes = {}
+
+    for entry in options or ():
+        name, values = entry.split("=")
+        sizes[name] = tuple(int(value) for value in values.split(","))
+
+    return sizes
+
+
+
+def main() -> int:
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", default=",".join(CASES))
+    parser.add_argument("--sizes", metavar="CASE=N,N", action="append", help="override the population sizes of a case, repeatable")
+    parser.add_argument("--budget", type=float, default=0.5, help="seconds spent measuring each case")
+    parser.add_argument("--max-samples", type=int, default=2000)
+    parser.add_argument("--save", metavar="PATH")
+    parser.add_argument("--baseline", metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown")
+    args = parser.parse_args()
+
+    pygame.init()
+
+    sizes = parse_sizes(args.sizes)
+    baseline = {}
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    results = {}
+    failed = False
+
+    for name in args.cases.split(","):
+        setup, default_sizes = CASES[name]
+
+        for size in sizes.get(name, default_sizes):
+            key = f"{name}/{size}"
+            result = results[key] = bench(setup, size, args.budget, args.max_samples)
+
+            line = f"{key:<20} {result['ms']:10.4f} ms  p90 {result['p90_ms']:10.4f} ms"
+
+            if key in baseline:
+                ratio = result["ms"] / max(baseline[key]["ms"], 1e-9)
+                line += f"  {ratio:5.2f}x baseline"
+
+                if ratio > 1 + args.threshold:
+                    line += "  FAIL: regression"
+                    failed = True
+
+            print(line)
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=4)
+
+    pygame.quit()
+
+    return 1 if failed else 0
+
+
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+
+"""
+Cold-start import cost of toolbox, measured with python -X importtime.
+
+    python benchmarks/import_time.py                     print timings
+    python benchmarks/import_time.py --save base.json    store timings as a baseline
+    python benchmarks/import_time.py --baseline base.json --threshold 0.25
+
+Exits with 1 if a pygame-free scenario imported pygame, or if a scenario is slower than the
+baseline by more than the threshold.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name : (statement, may import pygame)
+SCENARIOS = {
+    "import_toolbox": ("import toolbox", False),
+    "time_only": ("import toolbox; toolbox.StopwatchManager; toolbox.TimerManager", False),
+    "time_submodules": ("import toolbox.time.stopwatch, toolbox.time.timeout_timer", False),
+    "full": ("import toolbox; toolbox.Game; toolbox.Window; toolbox.Renderer; toolbox.EventManager", True),
+}
+
+
+
+
+
+def measure(statement:str) -> tuple[int, set[str]]:
+    """
+    Runs the statement in a fresh interpreter. Returns the summed cumulative import time of toolbox
+    and pygame in microseconds, and the set of top level modules imported.
+
+    statement : python source to run
+    """
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, capture_output=True, text=True, env=dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1"),
+    )
+
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr)
+
+    total = 0
+    modules = set()
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        _, cumulative, name = line[len("import time:"):].split("|")
+
+        # top level imports are not indented past the leading space
+        depth = len(name) - len(name.lstrip())
+        name = name.strip()
+
+        modules.add(name.split(".")[0])
+
+        if depth == 1 and name.split(".")[0] in ("toolbox", "pygame"):
+            total += int(cumulative)
+
+    return total, modules
+
+
+
+def run(repeat:int) -> dict[str, dict]:
+    """
+    Measures every scenario, keeping the fastest of repeat runs.
+
+    repeat : runs per scenario
+    """
+
+    results = {}
+
+    for name, (statement, allows_pygame) in SCENARIOS.items():
+        samples = [measure(statement) for _ in range(repeat)]
+
+        results[name] = {
+            "us": min(total for total, _ in samples),
+            "imports_pygame": any("pygame" in modules for _, modules in samples),
+            "allows_pygame": allows_pygame,
+        }
+
+    return results
+
+
+
+def main() -> int:
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", metavar="PATH")
+    parser.add_argument("--baseline", metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    baseline = {}
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    failed = False
+
+    for name, result in results.items():
+        line = f"{name:<18} {result['us'] / 1000:8.2f} ms  pygame={'yes' if result['imports_pygame'] else 'no'}"
+
+        if result["imports_pygame"] and not result["allows_pygame"]:
+            line += "  FAIL: imports pygame"
+            failed = True
+
+        if name in baseline:
+            ratio = result["us"] / max(baseline[name]["us"], 1)
+            line += f"  {ratio:5.2f}x baseline"
+
+            if ratio > 1 + args.threshold:
+                line += "  FAIL: regression"
+                failed = True
+
+        print(line)
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=4)
+
+    return 1 if failed else 0
+
+
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
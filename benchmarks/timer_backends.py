@@ -0,0 +1,155 @@
+
+"""
+TimerManager backends against the original linear tick_all, which called tick() on every timer.
+
+    python benchmarks/timer_backends.py
+    python benchmarks/timer_backends.py --sizes 1000,100000 --json timers.json
+
+For each population size this measures creating the timers, a frame tick with nothing expiring, a frame tick
+while 1% of the timers expire, and cancelling 10% of the timers.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from toolbox.time.timeout_timer import TimeoutTimer, TimerManager
+from toolbox.time.timer_schedulers import HeapScheduler, TimingWheelScheduler
+
+
+
+class LinearTimers:
+    """
+    The original TimerManager.tick_all, one tick() per timer per frame.
+    """
+
+    def __init__(self):
+
+        self.timers = {}
+
+    def create_timer(self, timer_id, duration, callback=None, start_immediately=False):
+
+        self.timers[timer_id] = TimeoutTimer(duration, callback, start_immediately)
+
+    def delete_timer(self, timer_id):
+
+        del self.timers[timer_id]
+
+    def tick_all(self):
+
+        for timer in self.timers.values():
+            timer.tick()
+
+
+
+BACKENDS = {
+    "linear": LinearTimers,
+    "heap": lambda: TimerManager(HeapScheduler()),
+    "wheel": lambda: TimerManager(TimingWheelScheduler()),
+}
+
+
+
+
+
+def timed_ticks(manager, budget:float, max_ticks:int) -> float:
+    """
+    Ticks repeatedly for about budget seconds, returns seconds per tick.
+    """
+
+    ticks = 0
+    start = time.perf_counter()
+
+    while ticks < max_ticks:
+        manager.tick_all()
+        ticks += 1
+
+        if time.perf_counter() - start > budget:
+            break
+
+    return (time.perf_counter() - start) / ticks
+
+
+
+def bench(backend:str, size:int, budget:float) -> dict[str, float]:
+
+    rng = random.Random(size)
+    manager = BACKENDS[backend]()
+
+    start = time.perf_counter()
+
+    for timer_id in range(size):
+        manager.create_timer(timer_id, rng.uniform(60, 600), None, True)
+
+    create = time.perf_counter() - start
+
+    idle_tick = timed_ticks(manager, budget, 1000)
+
+    # 1% of the timers expire over the next ~50 ms
+    expiring = max(size // 100, 1)
+
+    for timer_id in range(size, size + expiring):
+        manager.create_timer(timer_id, rng.uniform(0, 0.05), None, True)
+
+    time.sleep(0.06)
+
+    start = time.perf_counter()
+    manager.tick_all()
+    expire_tick = time.perf_counter() - start
+
+    cancelled = list(range(0, size, 10))
+
+    start = time.perf_counter()
+
+    for timer_id in cancelled:
+        manager.delete_timer(timer_id)
+
+    cancel = time.perf_counter() - start
+
+    return {
+        "create_us_per_timer": create / size * 1e6,
+        "idle_tick_ms": idle_tick * 1e3,
+        "expire_tick_ms": expire_tick * 1e3,
+        "cancel_us_per_timer": cancel / len(cancelled) * 1e6,
+    }
+
+
+
+def main() -> int:
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,100000,1000000")
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--budget", type=float, default=0.5, help="seconds spent measuring idle ticks per case")
+    parser.add_argument("--json", metavar="PATH")
+    args = parser.parse_args()
+
+    results = {}
+
+    print(f"{'backend':<8} {'timers':>9} {'create us':>10} {'idle tick ms':>13} {'expire tick ms':>15} {'cancel us':>10}")
+
+    for size in (int(size) for size in args.sizes.split(",")):
+        for backend in args.backends.split(","):
+            result = bench(backend, size, args.budget)
+            results[f"{backend}/{size}"] = result
+
+            print(f"{backend:<8} {size:>9} {result['create_us_per_timer']:>10.2f} {result['idle_tick_ms']:>13.4f} "
+                  f"{result['expire_tick_ms']:>15.3f} {result['cancel_us_per_timer']:>10.2f}")
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=4)
+
+    return 0
+
+
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
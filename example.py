@@ -25,55 +25,54 @@ class GameWithToolbox(toolbox.Game):
 
         self.add_pre_frame_update_batch(
             (self.event.poll, 0),
-            (lambda: self.event.handle_event(pygame.QUIT, self.quit_game), 1),
-            (self.win.clear, 2),
-            (self.timers.tick_all, 2)
+            (self.win.clear, 1),
+            (self.timers.tick_all, 1)
         )
 
-        self.add_post_frame_update(self.win.cycle, 0)
+        self.event.subscribe(pygame.QUIT, lambda event: self.quit_game())
+
+        self.add_post_frame_update_batch(
+            (self.stopwatches.end_frame, 0),
+            (self.win.cycle, 1)
+        )
 
 
-        self.timers.create_timer("debug_out", 5.0, self.debug, True)
-        self.timers.create_timer("generate_square", 1.0, self.generate_square, True)
+        self.timers.create_interval_timer("debug_out", 5.0, self.debug, True)
+        self.timers.create_interval_timer("generate_square", 1.0, self.generate_square, True, catch_up="all")
 
         self.stopwatches.create_new_stopwatch("window_runtime", True)
-        self.stopwatches.create_new_stopwatch("render_time", True)
 
 
-        self.squares = []
-        self.render_time = 0
+        self.squares = toolbox.EntityStore()
+        self.square_sprites = []
     
 
 
-    def generate_square(self):
+    def generate_square(self, expirations:int):
 
         square = pygame.Surface(( random.randint(10, 50),  random.randint(10, 50)))
         square.fill((random.randint(50, 255), random.randint(50, 255), random.randint(50, 255)))
-        self.squares.append((square, (random.randint(0, 1280), random.randint(0, 720))))
-
-        self.timers.timers["generate_square"].reset(True)
+        self.square_sprites.append(square)
+        self.squares.create((random.randint(0, 1280), random.randint(0, 720)), len(self.square_sprites) - 1)
     
 
 
-    def debug(self):
+    def debug(self, expirations:int):
 
         print(f"Runtime: {self.stopwatches.get_time_elapsed("window_runtime"):.2f}")
-        self.timers.timers["debug_out"].reset(True)
 
-        print(f"Render time: {self.render_time:.10f}")
+        print(self.stopwatches.dump_zones())
     
 
 
     def update(self):
         
-        self.stopwatches.stopwatches["render_time"].reset(True)
-
-        for square in self.squares:
-            self.renderer.queue("squares", square[0], square[1])
-
-        self.renderer.render(self.win.DISPLAY, "squares")
+        with self.stopwatches.zone("render"):
+            with self.stopwatches.zone("submit"):
+                self.squares.submit(self.renderer, "squares", self.square_sprites)
 
-        self.render_time = self.stopwatches.stopwatches["render_time"].stop()
+            with self.stopwatches.zone("draw"):
+                self.renderer.render(self.win.DISPLAY, "squares")
 
 
 
@@ -0,0 +1,41 @@
+
+import pytest
+
+from toolbox.time.clock import VirtualClock
+from toolbox.time.timeout_timer import TimerManager
+from toolbox.time.timer_schedulers import HeapScheduler, TimingWheelScheduler
+
+
+
+
+
+@pytest.mark.parametrize("scheduler", [HeapScheduler, TimingWheelScheduler])
+def test_timer_deleted_by_earlier_callback_does_not_fire(scheduler):
+
+    clock = VirtualClock()
+    manager = TimerManager(scheduler(), clock)
+
+    fired = []
+
+    manager.create_timer("a", 1.0, lambda: (fired.append("a"), manager.delete_timer("b")), True)
+    manager.create_timer("b", 1.0, lambda: fired.append("b"), True)
+
+    clock.advance(1.5)
+    manager.tick_all()
+
+    assert fired == ["a"]
+    assert not manager.exists("b")
+
+
+
+def test_group_scheduler_keeps_wheel_settings():
+
+    manager = TimerManager(TimingWheelScheduler(resolution=0.05, slot_bits=4, levels=3), VirtualClock())
+    manager.create_group("world")
+
+    scheduler = manager._groups["world"][1]
+
+    assert isinstance(scheduler, TimingWheelScheduler)
+    assert scheduler.resolution == 0.05
+    assert scheduler._size == 16
+    assert len(scheduler._wheels) == 3
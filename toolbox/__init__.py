@@ -1,10 +1,94 @@
 
-from .game.game import Game
+from importlib import import_module
 
-from .graphics.window import Window
-from .graphics.renderer import Renderer
 
-from .input.events import EventManager
 
-from .time.stopwatch import StopwatchManager, Stopwatch
-from .time.timeout_timer import TimerManager, TimeoutTimer
\ No newline at end of file
+# typing is a large import on its own; type checkers treat any TYPE_CHECKING name as True
+TYPE_CHECKING = False
+
+
+# Public names are imported on first attribute access (PEP 562), so importing toolbox
+# for the time utilities alone never imports pygame.
+_LAZY_ATTRIBUTES = {
+    "Game": ".game.game",
+    "EntityStore": ".game.entity_store",
+
+    "Window": ".graphics.window",
+    "Renderer": ".graphics.renderer",
+    "TextCache": ".graphics.text",
+    "GlyphAtlas": ".graphics.text",
+    "TileMap": ".graphics.tilemap",
+
+    "EventManager": ".input.events",
+    "EventSubscription": ".input.events",
+    "InputState": ".input.input_state",
+    "InputRecorder": ".input.recording",
+    "InputReplayer": ".input.recording",
+
+    "AssetManager": ".assets.asset_manager",
+    "AssetCache": ".assets.asset_cache",
+    "AssetArchive": ".assets.asset_archive",
+
+    "StopwatchManager": ".time.stopwatch",
+    "Stopwatch": ".time.stopwatch",
+    "TimerManager": ".time.timeout_timer",
+    "TimeoutTimer": ".time.timeout_timer",
+    "IntervalTimer": ".time.timeout_timer",
+    "Profiler": ".time.profiler",
+    "LatencyHistogram": ".time.profiler",
+    "TimerPool": ".time.timer_pool",
+    "TimerHandle": ".time.timer_pool",
+    "HeapScheduler": ".time.timer_schedulers",
+    "FrameClock": ".time.clock",
+    "VirtualClock": ".time.clock",
+    "GroupClock": ".time.clock",
+    "TimingWheelScheduler": ".time.timer_schedulers",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES.keys())
+
+
+
+if TYPE_CHECKING:
+    from .game.game import Game
+    from .game.entity_store import EntityStore
+
+    from .graphics.window import Window
+    from .graphics.renderer import Renderer
+    from .graphics.text import TextCache, GlyphAtlas
+    from .graphics.tilemap import TileMap
+
+    from .input.events import EventManager, EventSubscription
+    from .input.input_state import InputState
+    from .input.recording import InputRecorder, InputReplayer
+
+    from .assets.asset_manager import AssetManager
+    from .assets.asset_cache import AssetCache
+    from .assets.asset_archive import AssetArchive
+
+    from .time.stopwatch import StopwatchManager, Stopwatch
+    from .time.timeout_timer import TimerManager, TimeoutTimer, IntervalTimer
+    from .time.profiler import Profiler, LatencyHistogram
+    from .time.timer_pool import TimerPool, TimerHandle
+    from .time.timer_schedulers import HeapScheduler, TimingWheelScheduler
+    from .time.clock import FrameClock, GroupClock, VirtualClock
+
+
+
+def __getattr__(name:str):
+
+    module = _LAZY_ATTRIBUTES.get(name)
+
+    if module is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+
+    return value
+
+
+
+def __dir__() -> list[str]:
+
+    return sorted(set(globals().keys()) | set(__all__))
\ No newline at end of file
@@ -0,0 +1,160 @@
+
+import mmap
+import os
+import struct
+
+
+
+_MAGIC = b"TBXA"
+_VERSION = 1
+
+_HEADER = struct.Struct("<4sHIQ")
+_ENTRY = struct.Struct("<HQQ")
+
+
+
+
+
+class AssetArchive:
+
+    def __init__(self, path:str):
+        """
+        Opens a packed asset archive. The file is memory-mapped once and assets are read as slices of the map.
+
+        path : path to an archive written by AssetArchive.pack()
+        """
+
+        self.path = path
+
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._index = {}
+
+        magic, version, count, index_offset = _HEADER.unpack_from(self._map, 0)
+
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"'{path}' is not an asset archive")
+        if version != _VERSION:
+            self.close()
+            raise ValueError(f"Asset archive version {version} is not supported")
+
+        offset = index_offset
+
+        for _ in range(count):
+            name_length, data_offset, data_size = _ENTRY.unpack_from(self._map, offset)
+            offset += _ENTRY.size
+
+            name = bytes(self._map[offset:offset + name_length]).decode("utf-8")
+            offset += name_length
+
+            self._index[name] = (data_offset, data_size)
+
+
+
+    @staticmethod
+    def pack(path:str, sources:dict[str, str]) -> None:
+        """
+        Writes a packed archive of the passed files.
+
+        path : output archive path
+        sources : dictionary of {asset_id: file path} to pack
+        """
+
+        index = []
+
+        with open(path, "wb") as archive:
+            archive.write(_HEADER.pack(_MAGIC, _VERSION, 0, 0))
+
+            for asset_id, source in sources.items():
+                with open(source, "rb") as file:
+                    data = file.read()
+
+                index.append((asset_id.encode("utf-8"), archive.tell(), len(data)))
+                archive.write(data)
+
+            index_offset = archive.tell()
+
+            for name, data_offset, data_size in index:
+                archive.write(_ENTRY.pack(len(name), data_offset, data_size))
+                archive.write(name)
+
+            archive.seek(0)
+            archive.write(_HEADER.pack(_MAGIC, _VERSION, len(index), index_offset))
+
+
+
+    @staticmethod
+    def pack_directory(path:str, directory:str) -> None:
+        """
+        Writes a packed archive of every file under a directory. Asset ids are paths relative to the directory, using "/".
+
+        path : output archive path
+        directory : directory to pack
+        """
+
+        sources = {}
+
+        for root, _, files in os.walk(directory):
+            for file in sorted(files):
+                source = os.path.join(root, file)
+                sources[os.path.relpath(source, directory).replace(os.sep, "/")] = source
+
+        AssetArchive.pack(path, sources)
+
+
+
+    def read(self, asset_id:str) -> memoryview:
+        """
+        Returns a zero-copy view of an asset's bytes.
+
+        asset_id : string id for the asset
+        """
+
+        entry = self._index.get(asset_id)
+
+        if entry is None:
+            raise KeyError(f"Asset '{asset_id}' is not in archive '{self.path}'.")
+
+        offset, size = entry
+
+        return memoryview(self._map)[offset:offset + size]
+
+
+
+    def names(self) -> list[str]:
+        """
+        Returns a list of all asset ids in the archive.
+        """
+
+        return list(self._index.keys())
+
+
+
+    def close(self) -> None:
+        """
+        Closes the memory map and the archive file.
+        """
+
+        self._index.clear()
+        self._map.close()
+        self._file.close()
+
+
+
+    def __contains__(self, asset_id:str) -> bool:
+
+        return asset_id in self._index
+
+
+
+    def __len__(self) -> int:
+
+        return len(self._index)
+
+
+
+    def __repr__(self) -> str:
+
+        return f"<AssetArchive path='{self.path}' count={len(self)}>"
\ No newline at end of file
@@ -0,0 +1,207 @@
+
+from collections import OrderedDict
+from threading import RLock
+from typing import Any
+
+
+
+
+
+class AssetCache:
+
+    def __init__(self, memory_budget:int=256 * 1024 * 1024):
+        """
+        Pinned assets are never evicted and do not count against the memory budget. The most recently put asset is
+        kept even if it alone exceeds the budget, so an oversized asset is not evicted by the put that stored it.
+
+        memory_budget : maximum number of bytes held by unpinned assets before the least recently used are evicted
+        """
+
+        self.memory_budget = memory_budget
+
+        self._entries = OrderedDict()
+        self._pins = {}
+        self._memory_used = 0
+
+        self._lock = RLock()
+
+
+
+    def put(self, asset_id:str, asset:Any, size:int) -> None:
+        """
+        Stores an asset as the most recently used entry, then evicts down to the memory budget.
+
+        asset_id : string id for the asset
+        asset : loaded asset
+        size : size of the asset in bytes
+        """
+
+        with self._lock:
+            if asset_id in self._entries:
+                self._memory_used -= self._entries[asset_id][1]
+
+            self._entries[asset_id] = (asset, size)
+            self._entries.move_to_end(asset_id)
+            self._memory_used += size
+
+            self._evict(keep=asset_id)
+
+
+
+    def get(self, asset_id:str) -> Any:
+        """
+        Returns the cached asset and marks it as most recently used, else None.
+
+        asset_id : string id for the asset
+        """
+
+        with self._lock:
+            entry = self._entries.get(asset_id)
+
+            if entry is None:
+                return None
+
+            self._entries.move_to_end(asset_id)
+
+            return entry[0]
+
+
+
+    def remove(self, asset_id:str) -> None:
+        """
+        Removes an asset from the cache, pinned or not.
+
+        asset_id : string id for the asset
+        """
+
+        with self._lock:
+            entry = self._entries.pop(asset_id, None)
+
+            if entry is not None:
+                self._memory_used -= entry[1]
+
+            self._pins.pop(asset_id, None)
+
+
+
+    def pin(self, asset_id:str) -> None:
+        """
+        Keeps an asset resident regardless of the memory budget. Pins are counted, each pin needs an unpin.
+
+        asset_id : string id for the asset
+        """
+
+        with self._lock:
+            self._pins[asset_id] = self._pins.get(asset_id, 0) + 1
+
+
+
+    def unpin(self, asset_id:str) -> None:
+        """
+        Releases one pin on an asset, making it evictable again once all pins are released.
+
+        asset_id : string id for the asset
+        """
+
+        with self._lock:
+            count = self._pins.get(asset_id, 0)
+
+            if count <= 0:
+                raise RuntimeError(f"Asset '{asset_id}' is not pinned.")
+
+            if count == 1:
+                del self._pins[asset_id]
+                self._evict()
+            else:
+                self._pins[asset_id] = count - 1
+
+
+
+    def is_pinned(self, asset_id:str) -> bool:
+        """
+        Returns True if the asset is pinned.
+
+        asset_id : string id for the asset
+        """
+
+        return asset_id in self._pins
+
+
+
+    def clear(self, keep_pinned:bool=True) -> None:
+        """
+        Removes all cached assets.
+
+        keep_pinned : if True, pinned assets stay resident
+        """
+
+        with self._lock:
+            for asset_id in list(self._entries.keys()):
+                if keep_pinned and asset_id in self._pins:
+                    continue
+
+                self._memory_used -= self._entries.pop(asset_id)[1]
+
+            if not keep_pinned:
+                self._pins.clear()
+
+
+
+    def _evict(self, keep:str=None) -> None:
+
+        if self._memory_used <= self.memory_budget:
+            return
+
+        entries = self._entries
+
+        # pinned bytes are outside the budget
+        unpinned = self._memory_used - sum(entries[asset_id][1] for asset_id in self._pins if asset_id in entries)
+
+        for asset_id in list(entries.keys()):
+            if unpinned <= self.memory_budget:
+                break
+
+            if asset_id in self._pins or asset_id == keep:
+                continue
+
+            size = entries.pop(asset_id)[1]
+            self._memory_used -= size
+            unpinned -= size
+
+
+
+    @property
+    def memory_used(self) -> int:
+        """
+        Returns the number of bytes held by cached assets, pinned ones included
+        """
+
+        return self._memory_used
+
+
+
+    def keys(self) -> list[str]:
+        """
+        Returns the ids of all cached assets, least recently used first.
+        """
+
+        with self._lock:
+            return list(self._entries)
+
+
+
+    def __contains__(self, asset_id:str) -> bool:
+
+        return asset_id in self._entries
+
+
+
+    def __len__(self) -> int:
+
+        return len(self._entries)
+
+
+
+    def __repr__(self) -> str:
+
+        return f"<AssetCache count={len(self)} memory={self._memory_used}/{self.memory_budget} pinned={len(self._pins)}>"
\ No newline at end of file
@@ -0,0 +1,242 @@
+
+import io
+import os
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from queue import Empty, SimpleQueue
+from threading import Lock
+from typing import Callable
+
+import pygame
+
+from .asset_archive import AssetArchive
+from .asset_cache import AssetCache
+
+
+
+
+
+class AssetManager:
+
+    def __init__(self, root:str="", memory_budget:int=256 * 1024 * 1024, workers:int=4, archive:AssetArchive=None,
+                 on_error:Callable[[str, BaseException], None]=None):
+        """
+        Failed async loads are reported from update() through on_error, or kept for get_failures() when on_error is None.
+
+        root : directory asset ids are resolved against when they are not in the archive
+        memory_budget : byte budget of the asset cache
+        workers : number of background loader threads
+        archive : optional packed archive, checked before the filesystem
+        on_error : optional callable, passed the asset id and the exception of a failed load_async() request
+        """
+
+        self.root = root
+        self.archive = archive
+        self.on_error = on_error
+
+        self.cache = AssetCache(memory_budget)
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="toolbox-assets")
+
+        self._pending = {}
+        self._pending_lock = Lock()
+
+        self._completed = SimpleQueue()
+
+        self._failures = deque(maxlen=100)
+
+
+
+    def load(self, asset_id:str) -> pygame.Surface:
+        """
+        Loads an image synchronously, returning the cached surface if already loaded.
+
+        asset_id : string id for the asset
+        """
+
+        surface = self.cache.get(asset_id)
+
+        if surface is not None:
+            return surface
+
+        return self._request(asset_id).result()
+
+
+
+    def load_async(self, asset_id:str, callback:Callable[[pygame.Surface], None]=None) -> Future:
+        """
+        Loads an image on a background thread. Requests for an asset that is already loading share the same future.
+
+        asset_id : string id for the asset
+        callback : optional callable, passed the surface from update() on the main thread once loaded
+        """
+
+        surface = self.cache.get(asset_id)
+
+        if surface is not None:
+            future = Future()
+            future.set_result(surface)
+
+            if callback is not None:
+                self._completed.put((asset_id, callback, future))
+
+            return future
+
+        future = self._request(asset_id)
+
+        # queued with or without a callback, so update() reports a failed load
+        future.add_done_callback(lambda done: self._completed.put((asset_id, callback, done)))
+
+        return future
+
+
+
+    def _request(self, asset_id:str) -> Future:
+
+        with self._pending_lock:
+            future = self._pending.get(asset_id)
+
+            if future is None:
+                future = self._executor.submit(self._load, asset_id)
+                self._pending[asset_id] = future
+
+        return future
+
+
+
+    def update(self) -> None:
+        """
+        Runs callbacks of finished loads and reports failed loads on the calling thread. Call once per frame.
+        """
+
+        while True:
+            try:
+                asset_id, callback, future = self._completed.get_nowait()
+            except Empty:
+                return
+
+            exception = future.exception()
+
+            if exception is not None:
+                if self.on_error is not None:
+                    self.on_error(asset_id, exception)
+                else:
+                    self._failures.append((asset_id, exception))
+            elif callback is not None:
+                callback(future.result())
+
+
+
+    def get_failures(self) -> list[tuple[str, BaseException]]:
+        """
+        Returns and clears the (asset id, exception) pairs of failed load_async() requests not passed to on_error.
+        Only the latest 100 are kept.
+        """
+
+        failures = list(self._failures)
+        self._failures.clear()
+
+        return failures
+
+
+
+    def get(self, asset_id:str) -> pygame.Surface | None:
+        """
+        Returns the cached surface if loaded, else None. Never loads.
+
+        asset_id : string id for the asset
+        """
+
+        return self.cache.get(asset_id)
+
+
+
+    def is_loaded(self, asset_id:str) -> bool:
+        """
+        Returns True if the asset is in the cache.
+
+        asset_id : string id for the asset
+        """
+
+        return asset_id in self.cache
+
+
+
+    def is_loading(self, asset_id:str) -> bool:
+        """
+        Returns True if the asset is being loaded.
+
+        asset_id : string id for the asset
+        """
+
+        return asset_id in self._pending
+
+
+
+    def pin(self, asset_id:str) -> None:
+        """
+        Keeps an asset resident regardless of the memory budget.
+
+        asset_id : string id for the asset
+        """
+
+        self.cache.pin(asset_id)
+
+
+
+    def unpin(self, asset_id:str) -> None:
+        """
+        Releases one pin on an asset.
+
+        asset_id : string id for the asset
+        """
+
+        self.cache.unpin(asset_id)
+
+
+
+    def unload(self, asset_id:str) -> None:
+        """
+        Removes an asset from the cache.
+
+        asset_id : string id for the asset
+        """
+
+        self.cache.remove(asset_id)
+
+
+
+    def shutdown(self, wait:bool=True) -> None:
+        """
+        Stops the loader threads.
+
+        wait : if True, waits for pending loads to finish
+        """
+
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+
+    def _load(self, asset_id:str) -> pygame.Surface:
+
+        try:
+            if self.archive is not None and asset_id in self.archive:
+                with self.archive.read(asset_id) as data:
+                    surface = pygame.image.load(io.BytesIO(data), asset_id)
+            else:
+                surface = pygame.image.load(os.path.join(self.root, asset_id))
+
+            self.cache.put(asset_id, surface, surface.get_pitch() * surface.get_height())
+
+            return surface
+
+        finally:
+            with self._pending_lock:
+                self._pending.pop(asset_id, None)
+
+
+
+    def __repr__(self) -> str:
+
+        return f"<AssetManager loaded={len(self.cache)} loading={len(self._pending)} memory={self.cache.memory_used}>"
\ No newline at end of file
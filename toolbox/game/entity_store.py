@@ -0,0 +1,284 @@
+
+from typing import Callable, Sequence
+
+import numpy as np
+import pygame
+
+
+
+
+
+class EntityStore:
+
+    def __init__(self, capacity:int=1024):
+        """
+        Column-oriented entity storage. Live entities are packed into the first len(self) rows of each column.
+
+        capacity : initial number of rows, grows by doubling
+        """
+
+        self._count = 0
+
+        self._position = np.zeros((capacity, 2), dtype=np.float32)
+        self._velocity = np.zeros((capacity, 2), dtype=np.float32)
+        self._z_layer = np.zeros(capacity, dtype=np.int32)
+        self._sprite_id = np.zeros(capacity, dtype=np.int32)
+
+        self._index_to_entity = np.zeros(capacity, dtype=np.int64)
+        self._entity_to_index = {}
+        self._free_ids = []
+        self._next_id = 0
+
+        self._systems = []
+
+
+
+    def create(self, position:tuple[float, float], sprite_id:int, velocity:tuple[float, float]=(0, 0), z_layer:int=0) -> int:
+        """
+        Creates an entity and returns its id. Ids of removed entities are reused.
+
+        position : (x, y) position
+        sprite_id : index into the sprite sequence passed to submit()
+        velocity : (x, y) velocity in units per second
+        z_layer : z order for rendering
+        """
+
+        if self._count == len(self._position):
+            self._grow(max(len(self._position) * 2, 1))
+
+        entity_id = self._free_ids.pop() if self._free_ids else self._next_id
+
+        if entity_id == self._next_id:
+            self._next_id += 1
+
+        index = self._count
+        self._count += 1
+
+        self._position[index] = position
+        self._velocity[index] = velocity
+        self._z_layer[index] = z_layer
+        self._sprite_id[index] = sprite_id
+
+        self._index_to_entity[index] = entity_id
+        self._entity_to_index[entity_id] = index
+
+        return entity_id
+
+
+
+    def remove(self, entity_id:int) -> None:
+        """
+        Removes an entity by moving the last row into its slot.
+
+        entity_id : entity to remove
+        """
+
+        index = self._entity_to_index.pop(entity_id, None)
+
+        if index is None:
+            raise ValueError(f"Entity '{entity_id}' not found")
+
+        last = self._count - 1
+
+        if index != last:
+            self._position[index] = self._position[last]
+            self._velocity[index] = self._velocity[last]
+            self._z_layer[index] = self._z_layer[last]
+            self._sprite_id[index] = self._sprite_id[last]
+
+            moved = int(self._index_to_entity[last])
+            self._index_to_entity[index] = moved
+            self._entity_to_index[moved] = index
+
+        self._count = last
+        self._free_ids.append(entity_id)
+
+
+
+    def remove_where(self, mask:np.ndarray) -> None:
+        """
+        Removes every entity whose row is True in the passed mask.
+
+        mask : boolean array over the live rows, e.g. store.positions[:, 1] > 720
+        """
+
+        for entity_id in self._index_to_entity[:self._count][mask].tolist():
+            self.remove(entity_id)
+
+
+
+    def index_of(self, entity_id:int) -> int:
+        """
+        Returns the current row of an entity. Rows change when other entities are removed.
+
+        entity_id : entity to look up
+        """
+
+        index = self._entity_to_index.get(entity_id)
+
+        if index is None:
+            raise ValueError(f"Entity '{entity_id}' not found")
+
+        return index
+
+
+
+    def add_system(self, system:Callable[["EntityStore", float], None]) -> None:
+        """
+        Adds a per-frame system. Systems are called in order by update() with the store and dt.
+
+        system : callable operating on the column views
+        """
+
+        self._systems.append(system)
+
+
+
+    def remove_system(self, system:Callable[["EntityStore", float], None]) -> None:
+        """
+        Removes all instances of the given system.
+
+        system : system to remove
+        """
+
+        self._systems = [s for s in self._systems if s != system]
+
+
+
+    def update(self, dt:float) -> None:
+        """
+        Moves every entity by its velocity, then runs all systems.
+
+        dt : frame delta time in seconds
+        """
+
+        count = self._count
+
+        self._position[:count] += self._velocity[:count] * dt
+
+        for system in self._systems:
+            system(self, dt)
+
+
+
+    def submit(self, renderer, queue_id:str, sprites:Sequence[pygame.Surface], view:pygame.Rect=None) -> None:
+        """
+        Queues every visible entity to a render queue, one Renderer.queue_many() call per z layer.
+
+        renderer : Renderer to queue to
+        queue_id : queue to queue entities to
+        sprites : sequence of surfaces indexed by sprite id
+        view : optional visible area, entities fully outside of it are skipped
+        """
+
+        count = self._count
+
+        if count == 0:
+            return
+
+        position = self._position[:count]
+        sprite_id = self._sprite_id[:count]
+        z_layer = self._z_layer[:count]
+
+        if view is not None:
+            sizes = np.array([sprite.get_size() for sprite in sprites], dtype=np.float32)
+            size = sizes[sprite_id]
+
+            visible = ((position[:, 0] + size[:, 0] > view[0]) & (position[:, 0] < view[0] + view[2]) &
+                       (position[:, 1] + size[:, 1] > view[1]) & (position[:, 1] < view[1] + view[3]))
+
+            position = position[visible]
+            sprite_id = sprite_id[visible]
+            z_layer = z_layer[visible]
+
+        if len(z_layer) == 0:
+            return
+
+        layers = np.unique(z_layer)
+
+        for z in layers.tolist():
+            if len(layers) == 1:
+                ids, positions = sprite_id, position
+            else:
+                in_layer = z_layer == z
+                ids, positions = sprite_id[in_layer], position[in_layer]
+
+            renderer.queue_many(queue_id, zip(map(sprites.__getitem__, ids.tolist()), positions.tolist()), z)
+
+
+
+    def _grow(self, capacity:int) -> None:
+
+        self._position = np.resize(self._position, (capacity, 2))
+        self._velocity = np.resize(self._velocity, (capacity, 2))
+        self._z_layer = np.resize(self._z_layer, capacity)
+        self._sprite_id = np.resize(self._sprite_id, capacity)
+        self._index_to_entity = np.resize(self._index_to_entity, capacity)
+
+
+
+    @property
+    def positions(self) -> np.ndarray:
+        """
+        (n, 2) view of live entity positions
+        """
+
+        return self._position[:self._count]
+
+
+
+    @property
+    def velocities(self) -> np.ndarray:
+        """
+        (n, 2) view of live entity velocities
+        """
+
+        return self._velocity[:self._count]
+
+
+
+    @property
+    def z_layers(self) -> np.ndarray:
+        """
+        (n,) view of live entity z layers
+        """
+
+        return self._z_layer[:self._count]
+
+
+
+    @property
+    def sprite_ids(self) -> np.ndarray:
+        """
+        (n,) view of live entity sprite ids
+        """
+
+        return self._sprite_id[:self._count]
+
+
+
+    @property
+    def entity_ids(self) -> np.ndarray:
+        """
+        (n,) view of the entity id stored in each live row
+        """
+
+        return self._index_to_entity[:self._count]
+
+
+
+    def __contains__(self, entity_id:int) -> bool:
+
+        return entity_id in self._entity_to_index
+
+
+
+    def __len__(self) -> int:
+
+        return self._count
+
+
+
+    def __repr__(self) -> str:
+
+        return f"<EntityStore count={self._count} capacity={len(self._position)} systems={len(self._systems)}>"
\ No newline at end of file
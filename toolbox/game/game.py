@@ -4,17 +4,37 @@ from typing import Callable
 from sys import exit
 from pygame import quit
 
+import pygame
+
+from ..input.events import EventManager
+from ..time.clock import FrameClock, VirtualClock, get_default_clock
+from ..time.timeout_timer import TimerManager
+
 
 
 class Game:
 
-    def __init__(self):
+    def __init__(self, clock:FrameClock | VirtualClock=None):
+        """
+        clock : optional clock sampled at the start of every frame, defaults to the default clock
+        """
         
+        self.clock = clock if clock is not None else get_default_clock()
+
         self._running = False
 
         self._pre_frame_updates = []
         self._post_frame_updates = []
 
+        self._idle_mode = False
+        self._idle_timers = None
+        self._idle_events = None
+        self._idle_grace_period = 0.25
+        self._idle_max_wait = None
+
+        self._activity_checks = []
+        self._awake_until = 0.0
+
     
 
     def add_pre_frame_update(self, update_call:Callable[[], None], priority:int=0) -> None:
@@ -89,6 +109,124 @@ class Game:
 
     
 
+    def enable_idle_mode(self, timers:TimerManager=None, events:EventManager=None, grace_period:float=0.25, max_wait:float=None) -> None:
+        """
+        While nothing is active, the loop blocks in pygame.event.wait instead of running frames. It wakes for input,
+        for events posted to the EventManager, and when the earliest timer is due. After waking it runs at full
+        frame rate for the grace period, and for as long as any activity check returns True.
+
+        timers : optional TimerManager whose next timeout bounds the wait
+        events : optional EventManager, posted events wake the loop and pending ones keep it awake. The SDL event
+                 that ends a wait is put back into it ahead of later events, without it the event is re-posted to SDL
+        grace_period : seconds of full rate frames after each wake
+        max_wait : optional upper bound in seconds for a single wait
+        """
+
+        self._idle_mode = True
+        self._idle_timers = timers
+        self._idle_events = events
+        self._idle_grace_period = grace_period
+        self._idle_max_wait = max_wait
+
+        if events is not None:
+            events.set_wake_on_post(True)
+
+
+
+    def disable_idle_mode(self) -> None:
+        """
+        Returns the loop to running every frame.
+        """
+
+        if self._idle_events is not None:
+            self._idle_events.set_wake_on_post(False)
+
+        self._idle_mode = False
+        self._idle_timers = None
+        self._idle_events = None
+
+
+
+    def add_activity_check(self, check:Callable[[], bool]) -> None:
+        """
+        Adds a callable that keeps the loop at full frame rate in idle mode while it returns True, e.g. a running animation.
+
+        check : callable returning True while active
+        """
+
+        self._activity_checks.append(check)
+
+
+
+    def remove_activity_check(self, check:Callable[[], bool]) -> None:
+        """
+        Removes all instances of the given activity check.
+
+        check : activity check to remove
+        """
+
+        self._activity_checks = [c for c in self._activity_checks if c != check]
+
+
+
+    def wake(self, duration:float=None) -> None:
+        """
+        Keeps the loop at full frame rate for a while in idle mode.
+
+        duration : seconds to stay awake, defaults to the idle grace period
+        """
+
+        duration = self._idle_grace_period if duration is None else duration
+        self._awake_until = max(self._awake_until, self.clock.precise_now() + duration)
+
+
+
+    def is_idle(self) -> bool:
+        """
+        Returns True if idle mode is enabled and nothing is active, i.e. the next frame will wait for activity.
+        """
+
+        if not self._idle_mode or self.clock.precise_now() < self._awake_until:
+            return False
+
+        if self._idle_events is not None and self._idle_events.pending_count:
+            return False
+
+        return not any(check() for check in self._activity_checks)
+
+
+
+    def _wait_for_activity(self) -> None:
+
+        # waiting would take the first queued event out of order
+        if pygame.event.peek():
+            self.wake()
+            return
+
+        timeout = self._idle_max_wait
+
+        if self._idle_timers is not None:
+            remaining = self._idle_timers.get_time_until_next_timeout()
+
+            if remaining is not None and (timeout is None or remaining < timeout):
+                timeout = remaining
+
+        if timeout is None:
+            event = pygame.event.wait()
+        else:
+            event = pygame.event.wait(max(int(timeout * 1000), 1))
+
+        if event.type != pygame.NOEVENT:
+            # hand the event back so EventManager.poll sees it this frame, ahead of anything queued since
+            if self._idle_events is not None:
+                self._idle_events.put_back(event)
+            else:
+                pygame.event.post(event)
+
+            self.wake()
+
+
+
     def update(self) -> None:
         """
         Update loop.
@@ -116,6 +254,11 @@ class Game:
         self._running = True
 
         while self._running:
+
+            if self._idle_mode and self.is_idle():
+                self._wait_for_activity()
+
+            self.clock.sample()
             
             for _, func in self._pre_frame_updates:
                 func()
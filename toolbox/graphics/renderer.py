@@ -1,4 +1,6 @@
 
+from typing import Iterable
+
 import pygame
 
 
@@ -67,6 +69,24 @@ class Renderer:
 
 
 
+    def queue_many(self, queue_id:str, items:Iterable[tuple[pygame.Surface, tuple[int, int]]], z_layer:int=0) -> None:
+        """
+        Queue many surfaces for render on the same z layer in one call
+
+        queue_id : queue to queue surfaces to
+        items : iterable of (surface, position) pairs
+        z_layer : z order for rendering
+        """
+
+        layer = self._render_queues[queue_id].get(z_layer)
+
+        if layer is None:
+            layer = self._render_queues[queue_id][z_layer] = []
+
+        layer.extend(items)
+
+
+
     def render(self, render_display:pygame.Surface, queue_id:str) -> None:
         """
         Blits surfaces of the passed queue to the passed surface
@@ -76,7 +96,6 @@ class Renderer:
         """
         
         for z in sorted(self._render_queues[queue_id].keys()):
-            for surface, position in self._render_queues[queue_id][z]:
-                render_display.blit(surface, position)
+            render_display.blits(self._render_queues[queue_id][z], doreturn=False)
             
         self._render_queues[queue_id].clear()
\ No newline at end of file
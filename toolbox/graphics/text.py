@@ -0,0 +1,261 @@
+
+import pygame
+
+from ..assets.asset_cache import AssetCache
+from .renderer import Renderer
+
+
+
+
+
+def _color_key(color:pygame.Color | tuple | str) -> tuple:
+
+    return tuple(pygame.Color(color))
+
+
+
+
+
+class TextCache:
+
+    def __init__(self, memory_budget:int=8 * 1024 * 1024):
+        """
+        Rendered strings keyed by font, text, color, antialias and background. A string is rendered once and
+        reused until it is evicted, least recently used first, once the cache exceeds its memory budget.
+
+        memory_budget : maximum number of bytes held by rendered strings
+        """
+
+        self.cache = AssetCache(memory_budget)
+
+        self._hits = 0
+        self._misses = 0
+
+
+
+    def render(self, font:pygame.font.Font, text:str, color:pygame.Color | tuple | str, antialias:bool=True,
+               background:pygame.Color | tuple | str=None) -> pygame.Surface:
+        """
+        Returns the rendered string, rendering it only if it is not cached. The surface is shared, do not draw on it.
+
+        font : pygame font to render with
+        text : string to render
+        color : text color
+        antialias : passed to pygame.font.Font.render
+        background : optional background color, None for a transparent background
+        """
+
+        key = (font, text, _color_key(color), antialias, _color_key(background) if background is not None else None)
+
+        surface = self.cache.get(key)
+
+        if surface is not None:
+            self._hits += 1
+            return surface
+
+        self._misses += 1
+
+        surface = font.render(text, antialias, color, background)
+        self.cache.put(key, surface, surface.get_pitch() * surface.get_height())
+
+        return surface
+
+
+
+    def queue(self, renderer:Renderer, queue_id:str, font:pygame.font.Font, text:str, position:tuple[int, int],
+              color:pygame.Color | tuple | str, z_layer:int=0, antialias:bool=True) -> None:
+        """
+        Renders a string through the cache and queues it on a renderer.
+
+        renderer : renderer to queue to
+        queue_id : queue to queue to
+        font : pygame font to render with
+        text : string to render
+        position : top left position
+        color : text color
+        z_layer : z order for rendering
+        antialias : passed to pygame.font.Font.render
+        """
+
+        renderer.queue(queue_id, self.render(font, text, color, antialias), position, z_layer)
+
+
+
+    @property
+    def hits(self) -> int:
+        """
+        Number of render() calls served from the cache
+        """
+
+        return self._hits
+
+
+
+    @property
+    def misses(self) -> int:
+        """
+        Number of render() calls that rendered
+        """
+
+        return self._misses
+
+
+
+    def clear(self) -> None:
+        """
+        Removes every rendered string.
+        """
+
+        self.cache.clear(keep_pinned=False)
+
+
+
+    def __repr__(self) -> str:
+
+        return f"<TextCache hits={self._hits} misses={self._misses} cache={self.cache}>"
+
+
+
+
+
+class GlyphAtlas:
+
+    DIGITS = "0123456789"
+
+    def __init__(self, font:pygame.font.Font, color:pygame.Color | tuple | str, characters:str=DIGITS + " .,:;-+%/()xX",
+                 antialias:bool=True):
+        """
+        Renders each character of a font once into a single atlas surface. Text is then drawn as one blit per
+        character from the atlas, which suits text that changes every frame, like counters and timers, where a
+        string cache would miss. Characters not in the atlas are added the first time they are used.
+        Glyphs advance by whole pixels, so long strings can come out a few pixels narrower than Font.render.
+        The atlas is converted to the display format when a display exists, create atlases after the window.
+
+        font : pygame font to render with
+        color : text color
+        characters : characters to render up front
+        antialias : passed to pygame.font.Font.render
+        """
+
+        self.font = font
+        self.color = color
+        self.antialias = antialias
+
+        self.height = font.get_height()
+
+        # character : (area in the atlas, advance)
+        self._glyphs = {}
+        self.atlas = None
+
+        self._build(dict.fromkeys(characters))
+
+
+
+    def _build(self, characters:dict[str, None]) -> None:
+
+        glyphs = [(character, self.font.render(character, self.antialias, self.color)) for character in characters]
+
+        width = sum(glyph.get_width() for _, glyph in glyphs)
+        atlas = pygame.Surface((max(width, 1), self.height), pygame.SRCALPHA)
+
+        # a plain blit onto the transparent atlas copies per-pixel alpha glyphs unchanged and leaves out the
+        # colorkeyed background of 8-bit glyphs rendered without antialiasing
+        x = 0
+        areas = {}
+
+        for character, glyph in glyphs:
+            atlas.blit(glyph, (x, 0))
+            areas[character] = (pygame.Rect(x, 0, glyph.get_width(), glyph.get_height()), glyph.get_width())
+            x += glyph.get_width()
+
+        if pygame.display.get_surface() is not None:
+            atlas = atlas.convert_alpha()
+
+        self.atlas = atlas
+        self._glyphs = areas
+
+
+
+    def _missing(self, text:str) -> None:
+
+        missing = [character for character in text if character not in self._glyphs]
+
+        if missing:
+            self._build(dict.fromkeys([*self._glyphs, *missing]))
+
+
+
+    def blits(self, text:str, position:tuple[int, int]) -> list[tuple[pygame.Surface, tuple[int, int], pygame.Rect]]:
+        """
+        Returns (atlas, position, area) blit tuples drawing the text, accepted by Renderer.queue_many and
+        pygame.Surface.blits.
+
+        text : string to draw
+        position : top left position
+        """
+
+        glyphs = self._glyphs
+        atlas = self.atlas
+
+        x, y = position
+        items = []
+
+        try:
+            for character in text:
+                area, advance = glyphs[character]
+                items.append((atlas, (x, y), area))
+                x += advance
+        except KeyError:
+            self._missing(text)
+            return self.blits(text, position)
+
+        return items
+
+
+
+    def queue(self, renderer:Renderer, queue_id:str, text:str, position:tuple[int, int], z_layer:int=0) -> None:
+        """
+        Queues the text's glyph blits on a renderer.
+
+        renderer : renderer to queue to
+        queue_id : queue to queue to
+        text : string to draw
+        position : top left position
+        z_layer : z order for rendering
+        """
+
+        renderer.queue_many(queue_id, self.blits(text, position), z_layer)
+
+
+
+    def render(self, text:str) -> pygame.Surface:
+        """
+        Returns a new surface with the text composed from the atlas, for use with Renderer.queue.
+
+        text : string to draw
+        """
+
+        surface = pygame.Surface(self.size(text), pygame.SRCALPHA)
+        surface.blits([(atlas, position, area, pygame.BLEND_RGBA_MAX) for atlas, position, area in self.blits(text, (0, 0))],
+                      doreturn=False)
+
+        return surface
+
+
+
+    def size(self, text:str) -> tuple[int, int]:
+        """
+        Returns the width and height the text takes up.
+
+        text : string to measure
+        """
+
+        self._missing(text)
+
+        return sum(self._glyphs[character][1] for character in text), self.height
+
+
+
+    def __repr__(self) -> str:
+
+        return f"<GlyphAtlas glyphs={len(self._glyphs)} size={self.atlas.get_size()}>"
@@ -0,0 +1,321 @@
+
+from typing import Sequence
+
+import numpy as np
+import pygame
+
+from ..assets.asset_cache import AssetCache
+
+
+
+
+
+class TileMap:
+
+    def __init__(self, size:tuple[int, int], tile_size:int, tiles:Sequence[pygame.Surface], chunk_size:int=16,
+                 memory_budget:int=64 * 1024 * 1024, position:tuple[int, int]=(0, 0), empty:int=-1):
+        """
+        Grid of tile ids in a NumPy array, drawn through pre-rendered chunk surfaces. A chunk is rendered the first
+        time it is submitted and only again after one of its tiles changed. Chunks are kept in an LRU cache, so
+        once the memory budget is exceeded the chunks that have been out of view the longest are evicted first.
+
+        size : (columns, rows) of the map
+        tile_size : width and height of a tile in pixels
+        tiles : sequence of tile surfaces indexed by tile id
+        chunk_size : width and height of a chunk in tiles
+        memory_budget : maximum number of bytes held by rendered chunks
+        position : world position of the map's top left corner
+        empty : tile id drawn as nothing
+        """
+
+        self.tile_size = tile_size
+        self.tiles = tiles
+        self.chunk_size = chunk_size
+        self.position = position
+        self.empty = empty
+
+        self._ids = np.full((size[1], size[0]), empty, dtype=np.int16)
+
+        self.cache = AssetCache(memory_budget)
+
+        self._chunk_pixels = chunk_size * tile_size
+        self._chunks_x = -(-size[0] // chunk_size)
+        self._chunks_y = -(-size[1] // chunk_size)
+
+        # chunks known to hold only empty tiles, never rendered or submitted
+        self._empty_chunks = set()
+
+
+
+    @property
+    def size(self) -> tuple[int, int]:
+        """
+        (columns, rows) of the map
+        """
+
+        return self._ids.shape[1], self._ids.shape[0]
+
+
+
+    @property
+    def ids(self) -> np.ndarray:
+        """
+        Read-only view of the tile id grid, indexed [row, column]. Edit through set_tile(), set_region() or load()
+        """
+
+        view = self._ids.view()
+        view.flags.writeable = False
+
+        return view
+
+
+
+    def get_tile(self, column:int, row:int) -> int:
+        """
+        Returns the tile id at a cell.
+
+        column : cell column
+        row : cell row
+        """
+
+        self._check_cell(column, row)
+
+        return int(self._ids[row, column])
+
+
+
+    def set_tile(self, column:int, row:int, tile_id:int) -> None:
+        """
+        Sets the tile id at a cell. Only the chunk holding the cell is re-rendered.
+
+        column : cell column
+        row : cell row
+        tile_id : index into tiles, or the empty id
+        """
+
+        self._check_cell(column, row)
+
+        if self._ids[row, column] != tile_id:
+            self._ids[row, column] = tile_id
+            self._invalidate(column, row, 1, 1)
+
+
+
+    def _check_cell(self, column:int, row:int) -> None:
+
+        # NumPy would wrap negative indices around to the other edge
+        if not (0 <= column < self._ids.shape[1] and 0 <= row < self._ids.shape[0]):
+            raise IndexError(f"Cell ({column}, {row}) is outside the map of size {self.size}")
+
+
+
+    def set_region(self, column:int, row:int, tile_ids:np.ndarray) -> None:
+        """
+        Sets a rectangle of cells. Only chunks where a tile changed are re-rendered.
+        Parts of the region outside the map are ignored.
+
+        column : left column of the region, may be negative
+        row : top row of the region, may be negative
+        tile_ids : 2D array of tile ids indexed [row, column]
+        """
+
+        tile_ids = np.asarray(tile_ids)
+        rows, columns = tile_ids.shape
+
+        left, top = max(column, 0), max(row, 0)
+        right, bottom = min(column + columns, self._ids.shape[1]), min(row + rows, self._ids.shape[0])
+
+        if left >= right or top >= bottom:
+            return
+
+        tile_ids = tile_ids[top - row:bottom - row, left - column:right - column]
+
+        region = self._ids[top:bottom, left:right]
+        changed = np.argwhere(region != tile_ids)
+
+        if not len(changed):
+            return
+
+        region[...] = tile_ids
+
+        for chunk_row, chunk_column in {(int(r) // self.chunk_size, int(c) // self.chunk_size)
+                                        for r, c in changed + (top, left)}:
+            self._invalidate_chunk(chunk_column, chunk_row)
+
+
+
+    def load(self, tile_ids:np.ndarray) -> None:
+        """
+        Replaces every tile id and drops all rendered chunks.
+
+        tile_ids : 2D array of tile ids indexed [row, column], the size of the map
+        """
+
+        tile_ids = np.asarray(tile_ids)
+
+        if tile_ids.shape != self._ids.shape:
+            raise ValueError(f"Expected tile ids of shape {self._ids.shape}, not {tile_ids.shape}")
+
+        self._ids[...] = tile_ids
+
+        self.cache.clear(keep_pinned=False)
+        self._empty_chunks.clear()
+
+
+
+    def _invalidate(self, column:int, row:int, columns:int, rows:int) -> None:
+
+        for chunk_row in range(row // self.chunk_size, (row + rows - 1) // self.chunk_size + 1):
+            for chunk_column in range(column // self.chunk_size, (column + columns - 1) // self.chunk_size + 1):
+                self._invalidate_chunk(chunk_column, chunk_row)
+
+
+
+    def _invalidate_chunk(self, chunk_column:int, chunk_row:int) -> None:
+
+        self.cache.remove((chunk_column, chunk_row))
+        self._empty_chunks.discard((chunk_column, chunk_row))
+
+
+
+    def invalidate(self) -> None:
+        """
+        Drops all rendered chunks, e.g. after the tile surfaces changed.
+        """
+
+        self.cache.clear(keep_pinned=False)
+        self._empty_chunks.clear()
+
+
+
+    def _render_chunk(self, chunk_column:int, chunk_row:int) -> pygame.Surface | None:
+
+        size = self.chunk_size
+        ids = self._ids[chunk_row * size:(chunk_row + 1) * size, chunk_column * size:(chunk_column + 1) * size]
+
+        rows, columns = np.nonzero(ids != self.empty)
+
+        if not len(rows):
+            self._empty_chunks.add((chunk_column, chunk_row))
+            return None
+
+        tile_size = self.tile_size
+        tiles = self.tiles
+
+        # edge chunks of maps that are not a multiple of the chunk size are smaller
+        surface = pygame.Surface((ids.shape[1] * tile_size, ids.shape[0] * tile_size), pygame.SRCALPHA)
+        surface.blits([(tiles[tile_id], (column * tile_size, row * tile_size))
+                       for tile_id, row, column in zip(ids[rows, columns].tolist(), rows.tolist(), columns.tolist())],
+                      doreturn=False)
+
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+
+        self.cache.put((chunk_column, chunk_row), surface, surface.get_pitch() * surface.get_height())
+
+        return surface
+
+
+
+    def get_chunk(self, chunk_column:int, chunk_row:int) -> pygame.Surface | None:
+        """
+        Returns a chunk's surface, rendering it if needed. None if the chunk has only empty tiles.
+
+        chunk_column : chunk column
+        chunk_row : chunk row
+        """
+
+        if (chunk_column, chunk_row) in self._empty_chunks:
+            return None
+
+        surface = self.cache.get((chunk_column, chunk_row))
+
+        if surface is None:
+            surface = self._render_chunk(chunk_column, chunk_row)
+
+        return surface
+
+
+
+    def submit(self, renderer, queue_id:str, view:pygame.Rect=None, z_layer:int=0) -> None:
+        """
+        Queues the chunks overlapping the view to a render queue in one Renderer.queue_many() call.
+        Chunks are queued at their world position.
+
+        renderer : Renderer to queue to
+        queue_id : queue to queue chunks to
+        view : optional visible area in world coordinates, every chunk is queued if None
+        z_layer : z order for rendering
+        """
+
+        chunk_pixels = self._chunk_pixels
+        origin_x, origin_y = self.position
+
+        if view is None:
+            first_column, first_row = 0, 0
+            last_column, last_row = self._chunks_x - 1, self._chunks_y - 1
+        else:
+            first_column = max((view[0] - origin_x) // chunk_pixels, 0)
+            first_row = max((view[1] - origin_y) // chunk_pixels, 0)
+            last_column = min((view[0] + view[2] - 1 - origin_x) // chunk_pixels, self._chunks_x - 1)
+            last_row = min((view[1] + view[3] - 1 - origin_y) // chunk_pixels, self._chunks_y - 1)
+
+        items = []
+
+        for chunk_row in range(int(first_row), int(last_row) + 1):
+            for chunk_column in range(int(first_column), int(last_column) + 1):
+                surface = self.get_chunk(chunk_column, chunk_row)
+
+                if surface is not None:
+                    items.append((surface, (origin_x + chunk_column * chunk_pixels, origin_y + chunk_row * chunk_pixels)))
+
+        if items:
+            renderer.queue_many(queue_id, items, z_layer)
+
+
+
+    def evict_outside(self, view:pygame.Rect, margin:int=1) -> None:
+        """
+        Drops rendered chunks further than margin chunks from the view, ahead of the memory budget.
+
+        view : visible area in world coordinates
+        margin : number of chunks around the view that are kept
+        """
+
+        chunk_pixels = self._chunk_pixels
+        origin_x, origin_y = self.position
+
+        first_column = (view[0] - origin_x) // chunk_pixels - margin
+        first_row = (view[1] - origin_y) // chunk_pixels - margin
+        last_column = (view[0] + view[2] - 1 - origin_x) // chunk_pixels + margin
+        last_row = (view[1] + view[3] - 1 - origin_y) // chunk_pixels + margin
+
+        for key in self.cache.keys():
+            chunk_column, chunk_row = key
+
+            if not (first_column <= chunk_column <= last_column and first_row <= chunk_row <= last_row):
+                self.cache.remove(key)
+
+
+
+    def cell_at(self, position:tuple[float, float]) -> tuple[int, int] | None:
+        """
+        Returns the (column, row) of the cell under a world position, None if outside the map.
+
+        position : world position
+        """
+
+        column = int((position[0] - self.position[0]) // self.tile_size)
+        row = int((position[1] - self.position[1]) // self.tile_size)
+
+        if 0 <= column < self._ids.shape[1] and 0 <= row < self._ids.shape[0]:
+            return column, row
+
+        return None
+
+
+
+    def __repr__(self) -> str:
+
+        return (f"<TileMap size={self.size} chunks={self._chunks_x}x{self._chunks_y} "
+                f"rendered={len(self.cache)} memory={self.cache.memory_used}>")
@@ -1,24 +1,646 @@
 
-from typing import Callable
+from collections import deque
+from typing import Callable, TYPE_CHECKING
 
 import pygame
 
+if TYPE_CHECKING:
+    from .input_state import InputState
+
+
+
+def _merge_mouse_motion(events:list[pygame.event.Event]) -> pygame.event.Event:
+
+    attributes = dict(events[-1].dict)
+    attributes["rel"] = (sum(event.rel[0] for event in events), sum(event.rel[1] for event in events))
+
+    return pygame.event.Event(pygame.MOUSEMOTION, attributes)
+
+
+
+def _merge_mouse_wheel(events:list[pygame.event.Event]) -> pygame.event.Event:
+
+    attributes = dict(events[-1].dict)
+
+    for name in ("x", "y", "precise_x", "precise_y"):
+        if name in attributes:
+            attributes[name] = sum(event.dict[name] for event in events)
+
+    return pygame.event.Event(pygame.MOUSEWHEEL, attributes)
+
+
+
+def _merge_latest(events:list[pygame.event.Event]) -> pygame.event.Event:
+
+    return events[-1]
+
+
+
+# posted to the SDL queue by post() to wake a loop blocked in pygame.event.wait, never returned by poll()
+WAKE_EVENT = pygame.event.custom_type()
+
+
+
+# event type : (key separating independent streams, merge function)
+DEFAULT_COALESCING = {
+    pygame.MOUSEMOTION: (lambda event: event.dict.get("touch"), _merge_mouse_motion),
+    pygame.MOUSEWHEEL: (lambda event: (event.dict.get("which"), event.dict.get("touch")), _merge_mouse_wheel),
+    pygame.JOYAXISMOTION: (lambda event: (event.dict.get("instance_id", event.dict.get("joy")), event.dict.get("axis")), _merge_latest),
+}
+
+
+
+
+
+class EventSubscription:
+
+    def __init__(self, manager:"EventManager", event_type:int, callback:Callable[[pygame.event.Event], bool | None], priority:int):
+        
+        self.event_type = event_type
+        self.callback = callback
+        self.priority = priority
+
+        self._manager = manager
+
+
+
+    def unsubscribe(self) -> None:
+        """
+        Removes this subscription from its EventManager.
+        """
+
+        if self._manager is not None:
+            self._manager.unsubscribe(self)
+
+
+
+    def is_active(self) -> bool:
+        """
+        Returns True if still subscribed.
+        """
+
+        return self._manager is not None
+
+
+
+    def __repr__(self) -> str:
+
+        return f"<EventSubscription event_type={self.event_type} priority={self.priority} active={self.is_active()}>"
+
+
+
 
 
 class EventManager:
 
-    def __init__(self):
+    def __init__(self, event_source:Callable[[], list[pygame.event.Event]]=None, filter_events:bool=False, coalesce_events:bool=True,
+                 input_state:"InputState"=None, max_pending:int=10000, max_injected_per_frame:int=1000):
+        """
+        event_source : optional callable returning the next frame's events, defaults to pygame.event.get
+        filter_events : if True, SDL only queues event types that are subscribed, watched or always allowed
+        coalesce_events : if True, runs of motion, wheel and joystick axis events are merged into one event per run
+        input_state : optional InputState updated by every poll
+        max_pending : number of injected events queued before post() starts dropping them
+        max_injected_per_frame : number of injected events a single poll takes, the rest wait for later frames
+        """
         
         self._events = []
+        self._raw_events = []
+        self._buckets = {}
+
+        self._subscriptions = {}
+        self._dispatch_table = {}
+
+        self._filter_events = filter_events
+        self._watched_types = set()
+        self._always_allowed = {pygame.QUIT}
+        self._allowed_types = set()
+        self._filter_dirty = True
+        self._filtered_count = 0
+
+        # allowed set last applied to SDL, None while SDL is not filtered by this manager
+        self._sdl_allowed = None
+
+        self._coalescing = dict(DEFAULT_COALESCING) if coalesce_events else {}
+        self._coalesced_count = 0
+
+        self._event_source = event_source if event_source is not None else pygame.event.get
+
+        # deque appends and pops are atomic, so posting threads never take a lock
+        self._injected = deque()
+        self.max_pending = max_pending
+        self.max_injected_per_frame = max_injected_per_frame
+        self._dropped_count = 0
+
+        self._wake_on_post = False
+        self._wake_posted = False
+
+        # events taken off the SDL queue outside poll, e.g. by Game's idle wait, returned first by the next poll
+        self._put_back = []
+
+        self._input_state = None
+
+        if input_state is not None:
+            self.set_input_state(input_state)
 
 
     
     def poll(self) -> None:
         """
         Poll and cache all current events. Call once per frame.
+        Injected events follow the frame's SDL events, in the order they were posted.
         """
 
-        self._events = pygame.event.get()
+        if self._wake_on_post:
+            self._wake_posted = False
+
+        events = self._event_source()
+
+        if self._put_back:
+            events = self._put_back + events
+            self._put_back = []
+
+        if self._filter_events:
+            if self._filter_dirty:
+                self._sync_filter()
+
+            events = self._filter(events)
+
+        if self._wake_on_post:
+            events = [event for event in events if event.type != WAKE_EVENT]
+
+        if self._injected:
+            events = events + self._drain_injected()
+
+        self._raw_events = events
+
+        if self._coalescing:
+            events = self._coalesce(events)
+
+        # the per-type lists are kept between frames and refilled in place
+        buckets = self._buckets
+
+        for bucket in buckets.values():
+            bucket.clear()
+
+        for event in events:
+            bucket = buckets.get(event.type)
+
+            if bucket is None:
+                bucket = buckets[event.type] = []
+
+            bucket.append(event)
+
+        self._events = events
+
+        if self._input_state is not None:
+            self._input_state.update(events)
+
+        if self._dispatch_table:
+            self._dispatch(events)
+
+
+
+    def post(self, event_type:int, **attributes) -> bool:
+        """
+        Queues a custom event for the next poll. Safe to call from any thread.
+        Returns False, dropping the event, if max_pending events are already queued.
+
+        event_type : event type, e.g. from pygame.event.custom_type()
+        attributes : event attributes
+        """
+
+        return self.post_event(pygame.event.Event(event_type, attributes))
+
+
+
+    def post_event(self, event:pygame.event.Event) -> bool:
+        """
+        Queues an event for the next poll. Safe to call from any thread.
+        Returns False, dropping the event, if max_pending events are already queued.
+
+        event : event to queue
+        """
+
+        # the length check can race with other producers, so the limit is approximate
+        if len(self._injected) >= self.max_pending:
+            self._dropped_count += 1
+            return False
+
+        self._injected.append(event)
+
+        if self._wake_on_post and not self._wake_posted:
+            self._wake_posted = True
+            pygame.event.post(pygame.event.Event(WAKE_EVENT))
+
+        return True
+
+
+
+    def put_back(self, event:pygame.event.Event) -> None:
+        """
+        Returns an event taken off the SDL queue ahead of the next poll, which returns it before the events still
+        queued. Main thread only, unlike post().
+
+        event : event to return
+        """
+
+        self._put_back.append(event)
+
+
+
+    def set_wake_on_post(self, enabled:bool=True) -> None:
+        """
+        If enabled, post() also pushes a WAKE_EVENT to SDL, at most once per poll, so a loop idling in
+        pygame.event.wait wakes up for injected events. Enabled by Game.enable_idle_mode.
+
+        enabled : if True, posts wake the SDL queue
+        """
+
+        self._wake_on_post = enabled
+
+        if enabled:
+            self.always_allow(WAKE_EVENT)
+        else:
+            self.disallow(WAKE_EVENT)
+
+
+
+    def _drain_injected(self) -> list[pygame.event.Event]:
+
+        injected = self._injected
+        popleft = injected.popleft
+
+        return [popleft() for _ in range(min(len(injected), self.max_injected_per_frame))]
+
+
+
+    @property
+    def pending_count(self) -> int:
+        """
+        Number of injected events waiting for a poll
+        """
+
+        return len(self._injected)
+
+
+
+    @property
+    def dropped_count(self) -> int:
+        """
+        Number of injected events dropped because the queue was full
+        """
+
+        return self._dropped_count
+
+
+
+    def _dispatch(self, events:list[pygame.event.Event]) -> None:
+
+        table = self._dispatch_table
+
+        for event in events:
+            callbacks = table.get(event.type)
+
+            if callbacks is None:
+                continue
+
+            for callback in callbacks:
+                # a handler returning True stops propagation to lower priority handlers
+                if callback(event):
+                    break
+
+
+
+    def subscribe(self, event_type:int, callback:Callable[[pygame.event.Event], bool | None], priority:int=0) -> EventSubscription:
+        """
+        Subscribes a callback to an event type. Subscribers are called from poll() with each matching event,
+        in priority order. 0 is a higher priority than 1. A callback returning True stops propagation.
+
+        event_type : an int constant from pygame (e.g. pygame.QUIT)
+        callback : a callable passed the event
+        priority : integer representation of the callback's priority
+        """
+
+        subscription = EventSubscription(self, event_type, callback, priority)
+
+        is_new_type = event_type not in self._subscriptions
+
+        self._subscriptions.setdefault(event_type, []).append(subscription)
+        self._rebuild_dispatch(event_type)
+
+        if is_new_type:
+            self._invalidate_filter()
+
+        return subscription
+
+
+
+    def unsubscribe(self, subscription:EventSubscription) -> None:
+        """
+        Removes a subscription returned by subscribe().
+
+        subscription : subscription to remove
+        """
+
+        subscriptions = self._subscriptions.get(subscription.event_type, [])
+
+        if subscription in subscriptions:
+            subscriptions.remove(subscription)
+            subscription._manager = None
+
+            self._rebuild_dispatch(subscription.event_type)
+
+
+
+    def _rebuild_dispatch(self, event_type:int) -> None:
+
+        subscriptions = self._subscriptions.get(event_type)
+
+        if not subscriptions:
+            self._subscriptions.pop(event_type, None)
+            self._dispatch_table.pop(event_type, None)
+            self._invalidate_filter()
+            return
+
+        # sort is stable, equal priorities keep subscription order
+        subscriptions.sort(key=lambda subscription: subscription.priority)
+        self._dispatch_table[event_type] = tuple(subscription.callback for subscription in subscriptions)
+
+
+
+    def _coalesce(self, events:list[pygame.event.Event]) -> list[pygame.event.Event]:
+
+        coalescing = self._coalescing
+
+        for event in events:
+            if event.type in coalescing:
+                break
+        else:
+            return events
+
+        coalesced = []
+        run = {}
+        run_type = None
+
+        for event in events:
+            rule = coalescing.get(event.type)
+
+            if rule is None or event.type != run_type:
+                if run:
+                    self._flush_run(run, coalescing[run_type][1], coalesced)
+
+                run_type = None
+
+                if rule is None:
+                    coalesced.append(event)
+                    continue
+
+                run_type = event.type
+
+            # a run is split into independent streams, e.g. per joystick axis, merged separately
+            key = rule[0](event)
+            stream = run.get(key)
+
+            if stream is None:
+                run[key] = [event]
+            else:
+                stream.append(event)
+
+        if run:
+            self._flush_run(run, coalescing[run_type][1], coalesced)
+
+        return coalesced
+
+
+
+    def _flush_run(self, run:dict, merge:Callable[[list[pygame.event.Event]], pygame.event.Event], coalesced:list[pygame.event.Event]) -> None:
+
+        for stream in run.values():
+            if len(stream) == 1:
+                coalesced.append(stream[0])
+            else:
+                coalesced.append(merge(stream))
+                self._coalesced_count += len(stream) - 1
+
+        run.clear()
+
+
+
+    def set_input_state(self, input_state:"InputState"=None) -> None:
+        """
+        Attaches an InputState, updated once per poll before subscribers are called.
+
+        input_state : InputState to update, None detaches
+        """
+
+        if input_state is not None:
+            self.watch(*input_state.EVENT_TYPES)
+
+        self._input_state = input_state
+
+
+
+    @property
+    def input_state(self) -> "InputState":
+        """
+        Attached InputState, else None
+        """
+
+        return self._input_state
+
+
+
+    def set_coalescing(self, event_type:int, enabled:bool=True, key:Callable[[pygame.event.Event], object]=None,
+                       merge:Callable[[list[pygame.event.Event]], pygame.event.Event]=None) -> None:
+        """
+        Enables or disables coalescing for an event type. Consecutive events of the type are merged into one per stream.
+
+        event_type : an int constant from pygame (e.g. pygame.MOUSEMOTION)
+        enabled : if False, every event of the type is kept
+        key : optional callable returning the stream an event belongs to, defaults to the built in rule or one stream
+        merge : optional callable merging a list of events into one, defaults to the built in rule or keeping the latest
+        """
+
+        if not enabled:
+            self._coalescing.pop(event_type, None)
+            return
+
+        default_key, default_merge = DEFAULT_COALESCING.get(event_type, (lambda event: None, _merge_latest))
+
+        self._coalescing[event_type] = (key if key is not None else default_key, merge if merge is not None else default_merge)
+
+
+
+    def is_coalescing(self, event_type:int) -> bool:
+        """
+        Returns True if the event type is coalesced.
+
+        event_type : an int constant from pygame (e.g. pygame.MOUSEMOTION)
+        """
+
+        return event_type in self._coalescing
+
+
+
+    @property
+    def coalesced_count(self) -> int:
+        """
+        Number of events merged away by coalescing
+        """
+
+        return self._coalesced_count
+
+
+
+    def set_event_source(self, event_source:Callable[[], list[pygame.event.Event]]=None) -> None:
+        """
+        Replaces the callable events are polled from, e.g. with an InputReplayer.
+
+        event_source : callable returning the next frame's events, None restores pygame.event.get
+        """
+
+        self._event_source = event_source if event_source is not None else pygame.event.get
+        self._invalidate_filter()
+
+
+
+    def set_filtering(self, filter_events:bool) -> None:
+        """
+        Enables or disables SDL level event filtering. Disabling allows every event type again.
+
+        filter_events : if True, SDL only queues event types that are subscribed, watched or always allowed
+        """
+
+        if self._filter_events and not filter_events and self._sdl_allowed is not None:
+            pygame.event.set_allowed(None)
+            self._sdl_allowed = None
+
+        self._filter_events = filter_events
+        self._invalidate_filter()
+
+
+
+    def watch(self, *event_types:int) -> None:
+        """
+        Marks event types as wanted while filtering. is_event(), handle_event(), handle_event_with() and get_of_type()
+        watch their event type on first use; watching up front also keeps the first frame's events.
+
+        event_types : int constants from pygame (e.g. pygame.KEYDOWN)
+        """
+
+        for event_type in event_types:
+            if event_type not in self._watched_types:
+                self._watched_types.add(event_type)
+                self._invalidate_filter()
+
+
+
+    def unwatch(self, *event_types:int) -> None:
+        """
+        Stops watching event types. Types with subscribers or always allowed stay unfiltered.
+
+        event_types : int constants from pygame (e.g. pygame.KEYDOWN)
+        """
+
+        for event_type in event_types:
+            if event_type in self._watched_types:
+                self._watched_types.discard(event_type)
+                self._invalidate_filter()
+
+
+
+    def always_allow(self, *event_types:int) -> None:
+        """
+        Keeps event types unfiltered regardless of handlers. pygame.QUIT is always allowed by default.
+
+        event_types : int constants from pygame (e.g. pygame.VIDEORESIZE)
+        """
+
+        self._always_allowed.update(event_types)
+        self._invalidate_filter()
+
+
+
+    def disallow(self, *event_types:int) -> None:
+        """
+        Removes event types from the always allowed set.
+
+        event_types : int constants from pygame (e.g. pygame.QUIT)
+        """
+
+        self._always_allowed.difference_update(event_types)
+        self._invalidate_filter()
+
+
+
+    def get_allowed_types(self) -> set[int]:
+        """
+        Returns the set of event types that pass the filter.
+        """
+
+        return self._always_allowed | self._watched_types | self._subscriptions.keys()
+
+
+
+    @property
+    def filtered_count(self) -> int:
+        """
+        Number of events dropped by the filter after reaching Python. Events SDL discards never reach Python
+        and are not counted, so this mostly counts events queued before a type was blocked or from custom sources.
+        """
+
+        return self._filtered_count
+
+
+
+    def _invalidate_filter(self) -> None:
+
+        self._filter_dirty = True
+
+        # sync right away when possible so SDL stops dropping a newly wanted type before the next poll
+        if self._filter_events and pygame.display.get_init():
+            self._sync_filter()
+
+
+
+    def _sync_filter(self) -> None:
+
+        allowed = self._allowed_types = self.get_allowed_types()
+
+        if self._event_source is pygame.event.get:
+            synced = self._sdl_allowed
+
+            # SDL deletes queued events of a type when it is blocked, so only types leaving the set are ever
+            # blocked, never everything followed by a re-allow
+            if synced is None:
+                pygame.event.set_blocked([event_type for event_type in range(pygame.NUMEVENTS) if event_type not in allowed])
+
+                if allowed:
+                    pygame.event.set_allowed(list(allowed))
+            else:
+                left = synced - allowed
+                joined = allowed - synced
+
+                if left:
+                    pygame.event.set_blocked(list(left))
+                if joined:
+                    pygame.event.set_allowed(list(joined))
+
+            self._sdl_allowed = allowed
+
+        self._filter_dirty = False
+
+
+
+    def _filter(self, events:list[pygame.event.Event]) -> list[pygame.event.Event]:
+
+        allowed = self._allowed_types
+        kept = [event for event in events if event.type in allowed]
+
+        self._filtered_count += len(events) - len(kept)
+
+        return kept
 
 
 
@@ -29,7 +651,10 @@ class EventManager:
         event_type : an int constant from pygame (e.g. pygame.QUIT)
         """
 
-        return any(event.type == event_type for event in self._events)
+        if event_type not in self._watched_types:
+            self.watch(event_type)
+
+        return bool(self._buckets.get(event_type))
     
 
 
@@ -41,9 +666,11 @@ class EventManager:
         callback : a callable to callback on an event hit.
         """
 
-        for event in self._events:
-            if event.type == event_type:
-                callback()
+        if event_type not in self._watched_types:
+            self.watch(event_type)
+
+        for _ in self._buckets.get(event_type, ()):
+            callback()
 
     
 
@@ -55,9 +682,11 @@ class EventManager:
         callback : a callable to callback on an event hit.
         """
 
-        for event in self._events:
-            if event.type == event_type:
-                callback(event)
+        if event_type not in self._watched_types:
+            self.watch(event_type)
+
+        for event in self._buckets.get(event_type, ()):
+            callback(event)
     
 
 
@@ -66,4 +695,27 @@ class EventManager:
         Returns all events polled in the current frame.
         """
 
-        return self._events
\ No newline at end of file
+        return self._events
+
+
+
+    def get_raw(self) -> list[pygame.event.Event]:
+        """
+        Returns all events polled in the current frame before coalescing.
+        """
+
+        return self._raw_events
+
+
+
+    def get_of_type(self, event_type:int) -> list[pygame.event.Event]:
+        """
+        Returns the current frame's events of the specified type, in polled order. The list is reused next frame.
+
+        event_type : an int constant from pygame (e.g. pygame.QUIT)
+        """
+
+        if event_type not in self._watched_types:
+            self.watch(event_type)
+
+        return self._buckets.get(event_type, [])
\ No newline at end of file
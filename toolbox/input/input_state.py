@@ -0,0 +1,324 @@
+
+import numpy as np
+import pygame
+
+
+
+
+
+class InputState:
+
+    # event types update() reads, watched by an EventManager when attached
+    EVENT_TYPES = (pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION, pygame.WINDOWFOCUSLOST)
+
+    def __init__(self, capacity:int=256):
+        """
+        Per-frame keyboard and mouse button state. Every key and button seen gets a slot in a set of preallocated
+        arrays, and the pressed/released masks for all slots are computed together once per frame.
+
+        capacity : initial number of key and button slots, grows by doubling
+        """
+
+        self._key_slots = {}
+        self._button_slots = {}
+
+        self._current = np.zeros(capacity, dtype=np.bool_)
+        self._previous = np.zeros(capacity, dtype=np.bool_)
+        self._pressed = np.zeros(capacity, dtype=np.bool_)
+        self._released = np.zeros(capacity, dtype=np.bool_)
+        self._tapped = np.zeros(capacity, dtype=np.bool_)
+
+        self._actions = {}
+        self._action_index = {}
+        self._action_slots = np.zeros(0, dtype=np.intp)
+        self._action_offsets = np.zeros(0, dtype=np.intp)
+        self._action_buffer = np.zeros(0, dtype=np.bool_)
+        self._action_held = np.zeros(0, dtype=np.bool_)
+        self._action_pressed = np.zeros(0, dtype=np.bool_)
+        self._action_released = np.zeros(0, dtype=np.bool_)
+
+        self.mouse_position = (0, 0)
+        self.mouse_motion = (0, 0)
+
+
+
+    def update(self, events:list[pygame.event.Event]) -> None:
+        """
+        Advances one frame and applies the frame's events. Called by EventManager.poll when attached.
+
+        events : the frame's events, in polled order
+        """
+
+        np.copyto(self._previous, self._current)
+        self._tapped.fill(False)
+
+        motion_x = motion_y = 0
+
+        for event in events:
+            event_type = event.type
+
+            if event_type == pygame.MOUSEMOTION:
+                self.mouse_position = event.pos
+                motion_x += event.rel[0]
+                motion_y += event.rel[1]
+                continue
+
+            # _slot() may grow the arrays, so they are looked up after it
+            if event_type == pygame.KEYDOWN:
+                slot = self._slot(self._key_slots, event.key)
+                self._current[slot] = True
+            elif event_type == pygame.MOUSEBUTTONDOWN:
+                slot = self._slot(self._button_slots, event.button)
+                self._current[slot] = True
+            elif event_type == pygame.KEYUP or event_type == pygame.MOUSEBUTTONUP:
+                slots = self._key_slots if event_type == pygame.KEYUP else self._button_slots
+                slot = self._slot(slots, event.key if event_type == pygame.KEYUP else event.button)
+
+                # pressed and released within one frame would otherwise never show as pressed
+                if self._current[slot] and not self._previous[slot]:
+                    self._tapped[slot] = True
+
+                self._current[slot] = False
+            elif event_type == pygame.WINDOWFOCUSLOST:
+                self._current.fill(False)
+
+        self.mouse_motion = (motion_x, motion_y)
+
+        np.greater(self._current, self._previous, out=self._pressed)
+        np.logical_or(self._pressed, self._tapped, out=self._pressed)
+
+        np.greater(self._previous, self._current, out=self._released)
+        np.logical_or(self._released, self._tapped, out=self._released)
+
+        if len(self._action_offsets):
+            self._update_actions()
+
+
+
+    def _update_actions(self) -> None:
+
+        slots = self._action_slots
+        offsets = self._action_offsets
+        buffer = self._action_buffer
+
+        np.take(self._current, slots, out=buffer)
+        np.logical_or.reduceat(buffer, offsets, out=self._action_held)
+
+        np.take(self._pressed, slots, out=buffer)
+        np.logical_or.reduceat(buffer, offsets, out=self._action_pressed)
+
+        np.take(self._released, slots, out=buffer)
+        np.logical_or.reduceat(buffer, offsets, out=self._action_released)
+
+
+
+    def _slot(self, slots:dict[int, int], code:int) -> int:
+
+        slot = slots.get(code)
+
+        if slot is None:
+            slot = len(self._key_slots) + len(self._button_slots)
+
+            if slot == len(self._current):
+                self._grow(max(slot * 2, 1))
+
+            slots[code] = slot
+
+        return slot
+
+
+
+    def _grow(self, capacity:int) -> None:
+
+        for name in ("_current", "_previous", "_pressed", "_released", "_tapped"):
+            grown = np.zeros(capacity, dtype=np.bool_)
+            array = getattr(self, name)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+
+
+    def bind_action(self, action:str, keys:tuple[int, ...]=(), mouse_buttons:tuple[int, ...]=()) -> None:
+        """
+        Binds an action name to keys and mouse buttons. The action is held while any of them is held.
+        Rebinding an action replaces its bindings.
+
+        action : string id for the action
+        keys : int constants from pygame (e.g. pygame.K_SPACE)
+        mouse_buttons : mouse button numbers, 1 is the left button
+        """
+
+        if not keys and not mouse_buttons:
+            raise ValueError(f"Action '{action}' needs at least one key or mouse button")
+
+        self._actions[action] = ([self._slot(self._key_slots, key) for key in keys] +
+                                 [self._slot(self._button_slots, button) for button in mouse_buttons])
+
+        self._rebuild_actions()
+
+
+
+    def unbind_action(self, action:str) -> None:
+        """
+        Removes an action.
+
+        action : string id for the action
+        """
+
+        if self._actions.pop(action, None) is not None:
+            self._rebuild_actions()
+
+
+
+    def _rebuild_actions(self) -> None:
+
+        slots = []
+        offsets = []
+
+        self._action_index = {}
+
+        for index, (action, action_slots) in enumerate(self._actions.items()):
+            self._action_index[action] = index
+            offsets.append(len(slots))
+            slots.extend(action_slots)
+
+        self._action_slots = np.array(slots, dtype=np.intp)
+        self._action_offsets = np.array(offsets, dtype=np.intp)
+        self._action_buffer = np.zeros(len(slots), dtype=np.bool_)
+
+        self._action_held = np.zeros(len(offsets), dtype=np.bool_)
+        self._action_pressed = np.zeros(len(offsets), dtype=np.bool_)
+        self._action_released = np.zeros(len(offsets), dtype=np.bool_)
+
+        if len(offsets):
+            self._update_actions()
+
+
+
+    def is_key_held(self, key:int) -> bool:
+        """
+        Returns True if the key is down.
+
+        key : an int constant from pygame (e.g. pygame.K_SPACE)
+        """
+
+        slot = self._key_slots.get(key)
+
+        return slot is not None and bool(self._current[slot])
+
+
+
+    def is_key_pressed(self, key:int) -> bool:
+        """
+        Returns True if the key went down this frame.
+
+        key : an int constant from pygame (e.g. pygame.K_SPACE)
+        """
+
+        slot = self._key_slots.get(key)
+
+        return slot is not None and bool(self._pressed[slot])
+
+
+
+    def is_key_released(self, key:int) -> bool:
+        """
+        Returns True if the key went up this frame.
+
+        key : an int constant from pygame (e.g. pygame.K_SPACE)
+        """
+
+        slot = self._key_slots.get(key)
+
+        return slot is not None and bool(self._released[slot])
+
+
+
+    def is_mouse_held(self, button:int) -> bool:
+        """
+        Returns True if the mouse button is down.
+
+        button : mouse button number, 1 is the left button
+        """
+
+        slot = self._button_slots.get(button)
+
+        return slot is not None and bool(self._current[slot])
+
+
+
+    def is_mouse_pressed(self, button:int) -> bool:
+        """
+        Returns True if the mouse button went down this frame.
+
+        button : mouse button number, 1 is the left button
+        """
+
+        slot = self._button_slots.get(button)
+
+        return slot is not None and bool(self._pressed[slot])
+
+
+
+    def is_mouse_released(self, button:int) -> bool:
+        """
+        Returns True if the mouse button went up this frame.
+
+        button : mouse button number, 1 is the left button
+        """
+
+        slot = self._button_slots.get(button)
+
+        return slot is not None and bool(self._released[slot])
+
+
+
+    def is_action_held(self, action:str) -> bool:
+        """
+        Returns True if any binding of the action is down.
+
+        action : string id for the action
+        """
+
+        return bool(self._action_held[self._action_index[action]])
+
+
+
+    def is_action_pressed(self, action:str) -> bool:
+        """
+        Returns True if any binding of the action went down this frame.
+
+        action : string id for the action
+        """
+
+        return bool(self._action_pressed[self._action_index[action]])
+
+
+
+    def is_action_released(self, action:str) -> bool:
+        """
+        Returns True if any binding of the action went up this frame.
+
+        action : string id for the action
+        """
+
+        return bool(self._action_released[self._action_index[action]])
+
+
+
+    def clear(self) -> None:
+        """
+        Releases every key and button without reporting them as released.
+        """
+
+        for array in (self._current, self._previous, self._pressed, self._released, self._tapped,
+                      self._action_held, self._action_pressed, self._action_released):
+            array.fill(False)
+
+
+
+    def __repr__(self) -> str:
+
+        held = int(np.count_nonzero(self._current))
+
+        return f"<InputState keys={len(self._key_slots)} buttons={len(self._button_slots)} held={held} actions={len(self._actions)}>"
\ No newline at end of file
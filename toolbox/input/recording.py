@@ -0,0 +1,327 @@
+
+import atexit
+import marshal
+import struct
+
+from threading import Event, Lock, Thread
+from typing import Callable
+
+import pygame
+
+from .events import EventManager
+from ..time.clock import VirtualClock
+
+
+
+# Log layout, append-only:
+#   header : magic, version
+#   frame  : dt (float64), event count (uint32), then per event:
+#   event  : type (int32), attribute payload size (uint32), marshal'd attribute dict
+_MAGIC = b"TBXI"
+_VERSION = 1
+
+_HEADER = struct.Struct("<4sH")
+_FRAME = struct.Struct("<dI")
+_EVENT = struct.Struct("<iI")
+
+
+
+
+
+def _encode_attributes(event:pygame.event.Event) -> bytes:
+
+    try:
+        return marshal.dumps(event.dict)
+    except ValueError:
+        # drop attributes marshal can't store, e.g. window objects
+        attributes = {}
+
+        for key, value in event.dict.items():
+            try:
+                marshal.dumps(value)
+            except ValueError:
+                continue
+
+            attributes[key] = value
+
+        return marshal.dumps(attributes)
+
+
+
+
+
+class InputRecorder:
+
+    def __init__(self, path:str, event_manager:EventManager, dt_source:Callable[[], float], flush_interval:float=0.5):
+        """
+        Streams the events returned by EventManager.poll and the frame delta time to a binary log.
+        Frames are encoded on the main thread and written by a background thread. close() is registered with atexit,
+        so frames still buffered when the interpreter exits, e.g. through Game.quit_game or an uncaught exception,
+        are written too.
+
+        path : log file to create
+        event_manager : EventManager to record
+        dt_source : callable returning the current frame's delta time, e.g. lambda: window.dt
+        flush_interval : seconds between background writes
+        """
+
+        self.path = path
+        self.event_manager = event_manager
+        self.dt_source = dt_source
+        self.flush_interval = flush_interval
+
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION))
+
+        self._buffer = []
+        self._buffer_lock = Lock()
+
+        self._frames = 0
+
+        self._closing = Event()
+        self._writer = Thread(target=self._write_loop, name="toolbox-input-recorder", daemon=True)
+        self._writer.start()
+
+        atexit.register(self.close)
+
+
+
+    def record(self) -> None:
+        """
+        Records the current frame. Add as a pre-frame update after EventManager.poll.
+        """
+
+        events = self.event_manager.get()
+
+        chunks = [_FRAME.pack(self.dt_source(), len(events))]
+
+        for event in events:
+            attributes = _encode_attributes(event)
+            chunks.append(_EVENT.pack(event.type, len(attributes)))
+            chunks.append(attributes)
+
+        frame = b"".join(chunks)
+
+        with self._buffer_lock:
+            self._buffer.append(frame)
+
+        self._frames += 1
+
+
+
+    def close(self) -> None:
+        """
+        Writes all buffered frames and closes the log.
+        """
+
+        if self._closing.is_set():
+            return
+
+        self._closing.set()
+        self._writer.join()
+
+        atexit.unregister(self.close)
+
+        self._write_buffer()
+        self._file.close()
+
+
+
+    def _write_buffer(self) -> None:
+
+        with self._buffer_lock:
+            frames, self._buffer = self._buffer, []
+
+        if frames:
+            self._file.write(b"".join(frames))
+            self._file.flush()
+
+
+
+    def _write_loop(self) -> None:
+
+        while not self._closing.wait(self.flush_interval):
+            self._write_buffer()
+
+
+
+    @property
+    def frames(self) -> int:
+        """
+        Number of recorded frames
+        """
+
+        return self._frames
+
+
+
+    def __enter__(self) -> "InputRecorder":
+
+        return self
+
+
+
+    def __exit__(self, *_) -> None:
+
+        self.close()
+
+
+
+    def __repr__(self) -> str:
+
+        return f"<InputRecorder path='{self.path}' frames={self._frames}>"
+
+
+
+
+
+class InputReplayer:
+
+    def __init__(self, path:str, event_manager:EventManager=None, on_finished:Callable[[], None]=None, clock:VirtualClock=None):
+        """
+        Plays an InputRecorder log back through an EventManager, one recorded frame per poll, as fast as the loop runs.
+        Stands in for Window's dt and cycle() so a replay needs no display, and advances a virtual clock by the
+        recorded dt so timers and stopwatches see recorded time.
+
+        path : log file to replay
+        event_manager : optional EventManager to install into
+        on_finished : optional callable, called by cycle() once the last frame has been replayed
+        clock : optional VirtualClock to advance, pass it to the Game, TimerManager and StopwatchManager of the replay
+        """
+
+        self.path = path
+        self.on_finished = on_finished
+        self.clock = clock if clock is not None else VirtualClock()
+
+        with open(path, "rb") as file:
+            self._data = file.read()
+
+        magic, version = _HEADER.unpack_from(self._data, 0)
+
+        if magic != _MAGIC:
+            raise ValueError(f"'{path}' is not an input log")
+        if version != _VERSION:
+            raise ValueError(f"Input log version {version} is not supported")
+
+        self._offset = _HEADER.size
+        self._frame = 0
+
+        self.delta_time = 0
+        self._events = []
+
+        self._finished = not self._read_frame()
+
+        if event_manager is not None:
+            self.install(event_manager)
+
+
+
+    def install(self, event_manager:EventManager) -> None:
+        """
+        Makes the EventManager poll from this replay.
+
+        event_manager : EventManager to install into
+        """
+
+        event_manager.set_event_source(self.get_events)
+
+
+
+    def get_events(self) -> list[pygame.event.Event]:
+        """
+        Returns the current frame's recorded events.
+        """
+
+        return self._events
+
+
+
+    def cycle(self) -> None:
+        """
+        Advances to the next recorded frame. Add as a post-frame update in place of Window.cycle.
+        """
+
+        if self._finished:
+            return
+
+        self.clock.advance(self.delta_time)
+
+        self._frame += 1
+
+        if not self._read_frame():
+            self._finished = True
+            self._events = []
+
+            if self.on_finished is not None:
+                self.on_finished()
+
+
+
+    def _read_frame(self) -> bool:
+
+        data = self._data
+        offset = self._offset
+
+        # a frame cut off by an unclean shutdown ends the replay
+        if offset + _FRAME.size > len(data):
+            return False
+
+        dt, count = _FRAME.unpack_from(data, offset)
+        offset += _FRAME.size
+
+        events = []
+
+        for _ in range(count):
+            if offset + _EVENT.size > len(data):
+                return False
+
+            event_type, size = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+
+            if offset + size > len(data):
+                return False
+
+            events.append(pygame.event.Event(event_type, marshal.loads(data[offset:offset + size])))
+            offset += size
+
+        self._offset = offset
+        self.delta_time = dt
+        self._events = events
+
+        return True
+
+
+
+    @property
+    def dt(self) -> float:
+        """
+        Returns the current frame's recorded delta time
+        """
+
+        return self.delta_time
+
+
+
+    @property
+    def frame(self) -> int:
+        """
+        Index of the current frame
+        """
+
+        return self._frame
+
+
+
+    @property
+    def finished(self) -> bool:
+        """
+        True once every recorded frame has been replayed
+        """
+
+        return self._finished
+
+
+
+    def __repr__(self) -> str:
+
+        return f"<InputReplayer path='{self.path}' frame={self._frame} finished={self._finished}>"
\ No newline at end of file
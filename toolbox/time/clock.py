@@ -0,0 +1,328 @@
+
+import time
+
+
+
+
+
+class FrameClock:
+
+    def __init__(self):
+        """
+        Monotonic clock based on time.perf_counter_ns. sample() caches the time once per frame and now() returns
+        the cached value, so every timer and stopwatch in a frame agrees on the time without a syscall each.
+        Until the first sample(), now() reads the counter directly.
+        """
+
+        self._frame_ns = None
+        self._frame_time = None
+
+
+
+    def sample(self) -> float:
+        """
+        Caches the current time as the frame time and returns it. Called once per frame by Game.run.
+        """
+
+        self._frame_ns = time.perf_counter_ns()
+        self._frame_time = self._frame_ns / 1e9
+
+        return self._frame_time
+
+
+
+    def now(self) -> float:
+        """
+        Returns the frame time in seconds.
+        """
+
+        frame_time = self._frame_time
+
+        return frame_time if frame_time is not None else time.perf_counter_ns() / 1e9
+
+
+
+    def now_ns(self) -> int:
+        """
+        Returns the frame time in nanoseconds.
+        """
+
+        frame_ns = self._frame_ns
+
+        return frame_ns if frame_ns is not None else time.perf_counter_ns()
+
+
+
+    def precise_now(self) -> float:
+        """
+        Returns the current time in seconds, ignoring the frame time.
+        """
+
+        return time.perf_counter_ns() / 1e9
+
+
+
+    def precise_now_ns(self) -> int:
+        """
+        Returns the current time in nanoseconds, ignoring the frame time.
+        """
+
+        return time.perf_counter_ns()
+
+
+
+    def __repr__(self) -> str:
+
+        return f"<FrameClock frame_time={self._frame_time}>"
+
+
+
+
+
+class VirtualClock:
+
+    def __init__(self, start:float=0.0):
+        """
+        Manually advanced clock for tests and replays. now() and precise_now() both return the virtual time.
+
+        start : initial time in seconds
+        """
+
+        self._ns = round(start * 1e9)
+        self._time = self._ns / 1e9
+
+
+
+    def advance(self, seconds:float) -> None:
+        """
+        Moves the clock forward.
+
+        seconds : seconds to advance by
+        """
+
+        if seconds < 0:
+            raise ValueError("VirtualClock cannot go backwards")
+
+        self._ns += round(seconds * 1e9)
+        self._time = self._ns / 1e9
+
+
+
+    def set(self, seconds:float) -> None:
+        """
+        Sets the clock to a time, which may not be earlier than the current one.
+
+        seconds : time in seconds
+        """
+
+        self.advance(seconds - self._time)
+
+
+
+    def sample(self) -> float:
+        """
+        Returns the virtual time. Virtual time only moves through advance() and set().
+        """
+
+        return self._time
+
+
+
+    def now(self) -> float:
+        """
+        Returns the virtual time in seconds.
+        """
+
+        return self._time
+
+
+
+    def now_ns(self) -> int:
+        """
+        Returns the virtual time in nanoseconds.
+        """
+
+        return self._ns
+
+
+
+    precise_now = now
+    precise_now_ns = now_ns
+
+
+
+    def __repr__(self) -> str:
+
+        return f"<VirtualClock time={self._time}>"
+
+
+
+
+
+class GroupClock:
+
+    def __init__(self, parent:FrameClock | VirtualClock=None, scale:float=1.0):
+        """
+        Clock derived from a parent clock that can be paused and time-scaled in O(1). Timers and stopwatches that
+        read a group clock all freeze, slow down or speed up together without being touched individually.
+
+        parent : optional parent clock, defaults to the default clock
+        scale : group seconds per parent second
+        """
+
+        self.parent = parent if parent is not None else get_default_clock()
+
+        self._scale = scale
+        self._paused = False
+
+        # group time = base + (parent time - anchor) * scale
+        self._anchor = self.parent.now()
+        self._base = 0.0
+
+
+
+    def _rebase(self) -> None:
+
+        current = self.parent.now()
+
+        if not self._paused:
+            self._base += (current - self._anchor) * self._scale
+
+        self._anchor = current
+
+
+
+    def pause(self) -> None:
+        """
+        Freezes the group time.
+        """
+
+        if not self._paused:
+            self._rebase()
+            self._paused = True
+
+
+
+    def resume(self) -> None:
+        """
+        Unfreezes the group time.
+        """
+
+        if self._paused:
+            self._rebase()
+            self._paused = False
+
+
+
+    def is_paused(self) -> bool:
+        """
+        Returns True if paused.
+        """
+
+        return self._paused
+
+
+
+    @property
+    def scale(self) -> float:
+        """
+        Group seconds per parent second
+        """
+
+        return self._scale
+
+
+
+    @scale.setter
+    def scale(self, scale:float) -> None:
+
+        if scale < 0:
+            raise ValueError("GroupClock scale cannot be negative")
+
+        self._rebase()
+        self._scale = scale
+
+
+
+    def sample(self) -> float:
+        """
+        Returns the group time. The parent clock is the one sampled each frame.
+        """
+
+        return self.now()
+
+
+
+    def now(self) -> float:
+        """
+        Returns the group time in seconds, derived from the parent's frame time.
+        """
+
+        if self._paused:
+            return self._base
+
+        return self._base + (self.parent.now() - self._anchor) * self._scale
+
+
+
+    def now_ns(self) -> int:
+        """
+        Returns the group time in nanoseconds.
+        """
+
+        return round(self.now() * 1e9)
+
+
+
+    def precise_now(self) -> float:
+        """
+        Returns the group time in seconds, derived from the parent's current time.
+        """
+
+        if self._paused:
+            return self._base
+
+        return self._base + (self.parent.precise_now() - self._anchor) * self._scale
+
+
+
+    def precise_now_ns(self) -> int:
+        """
+        Returns the group time in nanoseconds, derived from the parent's current time.
+        """
+
+        return round(self.precise_now() * 1e9)
+
+
+
+    def __repr__(self) -> str:
+
+        return f"<GroupClock time={self.now():.3f} scale={self._scale} paused={self._paused}>"
+
+
+
+
+
+_default_clock = FrameClock()
+
+
+
+def get_default_clock() -> FrameClock | VirtualClock:
+    """
+    Returns the clock timers, stopwatches and games use when none is passed.
+    """
+
+    return _default_clock
+
+
+
+def set_default_clock(clock:FrameClock | VirtualClock) -> None:
+    """
+    Replaces the default clock. Only affects objects created afterwards.
+
+    clock : new default clock
+    """
+
+    global _default_clock
+
+    _default_clock = clock
\ No newline at end of file
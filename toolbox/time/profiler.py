@@ -0,0 +1,547 @@
+
+import functools
+import time
+
+from array import array
+from collections.abc import Callable
+
+from .clock import FrameClock, GroupClock, VirtualClock, get_default_clock
+
+
+
+# each power of two is split into 2 ** _SUB_BITS buckets, about 6% relative error
+_SUB_BITS = 4
+_SUB_COUNT = 1 << _SUB_BITS
+
+# covers values up to 2 ** 44 ns, about 4.9 hours; larger values land in the last bucket
+_BUCKETS = (44 - _SUB_BITS) * _SUB_COUNT + _SUB_COUNT
+
+# raw samples a zone buffers before they are binned, bounds memory when end_frame() is not called
+_FLUSH_SIZE = 4096
+
+# below this many samples binning one by one is cheaper than the fixed cost of the NumPy pass
+_VECTORIZE_SIZE = 64
+
+
+
+
+
+class LatencyHistogram:
+
+    __slots__ = ("_counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        """
+        Fixed-memory histogram of nanosecond durations. Buckets are log-spaced, 16 per power of two, so
+        percentiles are accurate to about 6% at any magnitude.
+        """
+
+        self._counts = array("Q", bytes(8 * _BUCKETS))
+
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+
+
+    def record(self, value:int) -> None:
+        """
+        Adds a sample.
+
+        value : duration in nanoseconds
+        """
+
+        if value < 0:
+            value = 0
+
+        shift = value.bit_length() - _SUB_BITS - 1
+
+        if shift <= 0:
+            index = value
+        else:
+            index = min(shift * _SUB_COUNT + (value >> shift), _BUCKETS - 1)
+
+        self._counts[index] += 1
+
+        self.count += 1
+        self.total += value
+
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+
+
+    def record_many(self, values:array) -> None:
+        """
+        Adds samples in one vectorized pass.
+
+        values : array('q') of durations in nanoseconds
+        """
+
+        if not values:
+            return
+
+        import numpy as np
+
+        samples = np.maximum(np.frombuffer(values, dtype=np.int64), 0)
+
+        # frexp's exponent is the bit length, exact below 2 ** 53
+        shift = np.frexp(samples.astype(np.float64))[1].astype(np.int64) - _SUB_BITS - 1
+        np.maximum(shift, 0, out=shift)
+
+        indices = shift * _SUB_COUNT + (samples >> shift)
+        indices[shift == 0] = samples[shift == 0]
+        np.minimum(indices, _BUCKETS - 1, out=indices)
+
+        counts = np.frombuffer(self._counts, dtype=np.uint64)
+        counts += np.bincount(indices, minlength=_BUCKETS).astype(np.uint64)
+
+        low = int(samples.min())
+        high = int(samples.max())
+
+        self.count += len(samples)
+        self.total += int(samples.sum())
+
+        if self.min is None or low < self.min:
+            self.min = low
+        if self.max is None or high > self.max:
+            self.max = high
+
+
+
+    def percentile(self, percent:float) -> int | None:
+        """
+        Returns the value below which the given percentage of samples fall, None if empty.
+
+        percent : percentage between 0 and 100
+        """
+
+        if not self.count:
+            return None
+
+        if percent >= 100:
+            return self.max
+
+        rank = max(percent / 100 * self.count, 1)
+        seen = 0
+
+        for index, count in enumerate(self._counts):
+            seen += count
+
+            if seen >= rank:
+                return min(max(self._bucket_value(index), self.min), self.max)
+
+        return self.max
+
+
+
+    def _bucket_value(self, index:int) -> int:
+
+        # midpoint of the bucket
+        if index < 2 * _SUB_COUNT:
+            return index
+
+        shift = index // _SUB_COUNT - 1
+        mantissa = index - shift * _SUB_COUNT
+
+        return (mantissa << shift) + (1 << (shift - 1))
+
+
+
+    def mean(self) -> float | None:
+        """
+        Returns the mean sample, None if empty.
+        """
+
+        return self.total / self.count if self.count else None
+
+
+
+    def clear(self) -> None:
+        """
+        Removes all samples.
+        """
+
+        self._counts = array("Q", bytes(8 * _BUCKETS))
+
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+
+
+    def __repr__(self) -> str:
+
+        return f"<LatencyHistogram count={self.count} p50={self.percentile(50)} p99={self.percentile(99)}>"
+
+
+
+
+
+class ProfileZone:
+
+    __slots__ = ("name", "parent", "children", "histogram", "frame_histogram", "_samples", "_in_frame", "_frame_calls", "_frame_total",
+                 "last_frame_calls", "last_frame_total")
+
+    def __init__(self, name:str, parent:"ProfileZone | None"):
+        """
+        Node of the zone tree, one per distinct path of nested zone names. Created by Profiler.
+
+        name : zone name
+        parent : enclosing zone, None for the root
+        """
+
+        self.name = name
+        self.parent = parent
+        self.children = {}
+
+        # one sample per zone exit, and one sample per frame holding the frame's total time in the zone
+        self.histogram = LatencyHistogram()
+        self.frame_histogram = LatencyHistogram()
+
+        # raw durations since the last flush, binned in bulk by _flush()
+        self._samples = array("q")
+        self._in_frame = False
+
+        self._frame_calls = 0
+        self._frame_total = 0
+
+        self.last_frame_calls = 0
+        self.last_frame_total = 0
+
+
+
+    def _flush(self) -> None:
+
+        samples = self._samples
+
+        if samples:
+            if len(samples) < _VECTORIZE_SIZE:
+                record = self.histogram.record
+
+                for sample in samples:
+                    record(sample)
+            else:
+                self.histogram.record_many(samples)
+
+            self._frame_calls += len(samples)
+            self._frame_total += sum(samples)
+
+            self._samples = array("q")
+
+
+
+    @property
+    def path(self) -> str:
+        """
+        Zone names from the outermost zone down, joined by "/"
+        """
+
+        names = []
+        zone = self
+
+        while zone.parent is not None:
+            names.append(zone.name)
+            zone = zone.parent
+
+        return "/".join(reversed(names))
+
+
+
+    def get_stats(self) -> dict[str, float | int | None]:
+        """
+        Returns the zone's statistics in seconds.
+        """
+
+        self._flush()
+
+        histogram = self.histogram
+        frames = self.frame_histogram
+
+        def seconds(value:int | float | None) -> float | None:
+            return value / 1e9 if value is not None else None
+
+        return {
+            "calls": histogram.count,
+            "total": histogram.total / 1e9,
+            "mean": seconds(histogram.mean()),
+            "min": seconds(histogram.min),
+            "max": seconds(histogram.max),
+            "p50": seconds(histogram.percentile(50)),
+            "p99": seconds(histogram.percentile(99)),
+            "frames": frames.count,
+            "frame_p50": seconds(frames.percentile(50)),
+            "frame_p99": seconds(frames.percentile(99)),
+            "last_frame_calls": self.last_frame_calls,
+            "last_frame_total": self.last_frame_total / 1e9,
+        }
+
+
+
+    def __repr__(self) -> str:
+
+        return f"<ProfileZone path='{self.path}' calls={self.histogram.count}>"
+
+
+
+
+
+class ZoneScope:
+
+    __slots__ = ("_profiler", "name")
+
+    def __init__(self, profiler:"Profiler", name:str):
+        """
+        Context manager and decorator timing one zone. Nested scopes become child zones of the enclosing one.
+        Scopes are cached per name by Profiler.zone() and hold no per-entry state, so they can be reused and nested.
+
+        profiler : owning profiler
+        name : zone name
+        """
+
+        self._profiler = profiler
+        self.name = name
+
+
+
+    def __enter__(self) -> "ZoneScope":
+
+        profiler = self._profiler
+        current = profiler._current
+
+        zone = current.children.get(self.name)
+
+        if zone is None:
+            zone = current.children[self.name] = ProfileZone(self.name, current)
+
+        profiler._current = zone
+        profiler._starts.append(profiler._now_ns())
+
+        return self
+
+
+
+    def __exit__(self, *_) -> None:
+
+        profiler = self._profiler
+        elapsed = profiler._now_ns() - profiler._starts.pop()
+
+        zone = profiler._current
+        profiler._current = zone.parent
+
+        # only the raw sample is stored here, binning happens once per frame
+        samples = zone._samples
+        samples.append(elapsed)
+
+        if not zone._in_frame:
+            zone._in_frame = True
+            profiler._touched.append(zone)
+
+        if len(samples) >= _FLUSH_SIZE:
+            zone._flush()
+
+
+
+    def __call__(self, function:Callable) -> Callable:
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with self:
+                return function(*args, **kwargs)
+
+        return wrapper
+
+
+
+    def __repr__(self) -> str:
+
+        return f"<ZoneScope name='{self.name}'>"
+
+
+
+
+
+class Profiler:
+
+    def __init__(self, clock:FrameClock | VirtualClock | GroupClock=None):
+        """
+        Hierarchical zone profiler. Zone exits only append the raw duration to a buffer. end_frame() bins the
+        frame's durations into each zone's fixed-memory histogram in one vectorized pass, and rolls the time spent
+        in each zone during the frame up into a per-frame histogram. Zones must be entered and exited on the
+        same thread.
+
+        clock : optional clock read through precise_now_ns, defaults to the default clock
+        """
+
+        self._clock = clock if clock is not None else get_default_clock()
+
+        # skips a wrapper call per read, FrameClock.precise_now_ns is perf_counter_ns
+        self._now_ns = time.perf_counter_ns if type(self._clock) is FrameClock else self._clock.precise_now_ns
+
+        self.root = ProfileZone("", None)
+
+        self._scopes = {}
+
+        self._current = self.root
+        self._starts = []
+
+        self._touched = []
+        self._last_touched = []
+
+        self._frames = 0
+
+
+
+    def zone(self, name:str) -> ZoneScope:
+        """
+        Returns the scope for a zone name, usable as a context manager or a decorator.
+
+        name : zone name, nested zones are told apart by their enclosing zones
+        """
+
+        scope = self._scopes.get(name)
+
+        if scope is None:
+            scope = self._scopes[name] = ZoneScope(self, name)
+
+        return scope
+
+
+
+    def end_frame(self) -> None:
+        """
+        Rolls up the zones entered this frame. Add as a post-frame update.
+        """
+
+        # zones from the previous frame that were not entered this frame report an empty frame
+        for zone in self._last_touched:
+            zone.last_frame_calls = 0
+            zone.last_frame_total = 0
+
+        for zone in self._touched:
+            zone._flush()
+            zone._in_frame = False
+
+            zone.frame_histogram.record(zone._frame_total)
+
+            zone.last_frame_calls = zone._frame_calls
+            zone.last_frame_total = zone._frame_total
+
+            zone._frame_calls = 0
+            zone._frame_total = 0
+
+        self._last_touched, self._touched = self._touched, self._last_touched
+        self._touched.clear()
+
+        self._frames += 1
+
+
+
+    def get_zone(self, path:str) -> ProfileZone | None:
+        """
+        Returns a zone by path, None if it was never entered.
+
+        path : zone names joined by "/", e.g. "update/render"
+        """
+
+        zone = self.root
+
+        for name in path.split("/"):
+            zone = zone.children.get(name)
+
+            if zone is None:
+                return None
+
+        return zone
+
+
+
+    def get_zone_stats(self, path:str) -> dict[str, float | int | None]:
+        """
+        Returns a zone's statistics in seconds.
+
+        path : zone names joined by "/"
+        """
+
+        zone = self.get_zone(path)
+
+        if zone is None:
+            raise KeyError(f"Zone '{path}' does not exist.")
+
+        return zone.get_stats()
+
+
+
+    def export(self) -> dict[str, dict]:
+        """
+        Returns every zone's statistics keyed by path, parents before children.
+        """
+
+        zones = {}
+        pending = list(reversed(self.root.children.values()))
+
+        while pending:
+            zone = pending.pop()
+            zones[zone.path] = zone.get_stats()
+            pending.extend(reversed(zone.children.values()))
+
+        return zones
+
+
+
+    def dump(self) -> str:
+        """
+        Returns a text table of every zone in milliseconds, children indented under their parents.
+        """
+
+        lines = [f"{'zone':<32} {'calls':>8} {'mean':>9} {'p50':>9} {'p99':>9} {'max':>9} {'frame p99':>10} {'last frame':>11}"]
+
+        def ms(value:float | None) -> str:
+            return f"{value * 1e3:.3f}" if value is not None else "-"
+
+        for path, stats in self.export().items():
+            depth = path.count("/")
+            name = "  " * depth + path.rsplit("/", 1)[-1]
+
+            lines.append(f"{name:<32} {stats['calls']:>8} {ms(stats['mean']):>9} {ms(stats['p50']):>9} {ms(stats['p99']):>9} "
+                         f"{ms(stats['max']):>9} {ms(stats['frame_p99']):>10} {ms(stats['last_frame_total']):>11}")
+
+        return "\n".join(lines)
+
+
+
+    def reset(self) -> None:
+        """
+        Removes all zones and samples. Must not be called inside a zone.
+        """
+
+        if self._starts:
+            raise RuntimeError("Profiler cannot be reset inside a zone.")
+
+        self.root = ProfileZone("", None)
+        self._current = self.root
+
+        self._touched.clear()
+        self._last_touched.clear()
+
+        self._frames = 0
+
+
+
+    @property
+    def frames(self) -> int:
+        """
+        Number of end_frame() calls since creation or reset
+        """
+
+        return self._frames
+
+
+
+    def __repr__(self) -> str:
+
+        return f"<Profiler zones={len(self.export())} frames={self._frames}>"
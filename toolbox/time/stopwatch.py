@@ -1,19 +1,46 @@
 
-import time
+from array import array
+
+from .clock import FrameClock, GroupClock, VirtualClock, get_default_clock
+from .profiler import Profiler, ProfileZone, ZoneScope
 
 
 
 class Stopwatch:
 
-    def __init__(self, start_immediately:bool=False):
+    __slots__ = ("_clock", "precise", "_now", "_start_time", "_elapsed_pause", "_time_paused", "_running", "_paused", "_group",
+                 "max_laps", "_laps", "_lap_durations", "_lap_head", "_last_lap",
+                 "_lap_count", "_lap_mean", "_lap_m2", "_lap_min", "_lap_max")
+
+    def __init__(self, start_immediately:bool=False, clock:FrameClock | VirtualClock | GroupClock=None, precise:bool=False,
+                 max_laps:int=None):
+        """
+        Times are kept in integer nanoseconds and returned in seconds. Laps are stored in array('d') buffers, and
+        lap duration statistics are updated on every lap so they can be queried in O(1).
+
+        start_immediately : if True, stopwatch starts immediately
+        clock : optional clock, defaults to the default clock
+        precise : if True, reads the clock's current time instead of the cached frame time
+        max_laps : optional number of laps kept, older laps are overwritten. Statistics still cover every lap
+        """
         
+        if max_laps is not None and max_laps <= 0:
+            raise ValueError("max_laps must be greater than 0")
+
+        self._clock = clock if clock is not None else get_default_clock()
+        self.set_precise(precise)
+
         self._start_time = None
         self._elapsed_pause = 0
         self._time_paused = None
         self._running = False
         self._paused = False
 
-        self._laps = []
+        # group id, set by a StopwatchManager
+        self._group = None
+
+        self.max_laps = max_laps
+        self._clear_laps()
 
         if start_immediately:
             self.start()
@@ -33,13 +60,13 @@ class Stopwatch:
         if self._paused:
             raise RuntimeError("Stopwatch cannot be started while paused. use resume()")
 
-        self._start_time = time.time() - initial_offset
+        self._start_time = self._now() - round(initial_offset * 1e9)
         self._elapsed_pause = 0
         self._time_paused = None
         self._running = True
         self._paused = False
 
-        self._laps = []
+        self._clear_laps()
 
     
 
@@ -64,7 +91,7 @@ class Stopwatch:
         self._time_paused = None
         self._elapsed_pause = 0
 
-        self._laps = []
+        self._clear_laps()
 
         return elapsed
     
@@ -79,7 +106,7 @@ class Stopwatch:
         
         
         if self._paused:
-            pause_duration = time.time() - self._time_paused
+            pause_duration = self._now() - self._time_paused
             self._elapsed_pause += pause_duration
             self._paused = False
             self._time_paused = None
@@ -97,7 +124,7 @@ class Stopwatch:
             raise RuntimeError("Stopwatch cannot be paused while already paused.")
         
         if self._running and not self._paused:
-            self._time_paused = time.time()
+            self._time_paused = self._now()
             self._paused = True
 
         if return_elapsed:
@@ -112,50 +139,131 @@ class Stopwatch:
         start_immediately : if True, will run the stopwatch immediately
         """
 
-        self._start_time = time.time() if start_immediately else None
+        self._start_time = self._now() if start_immediately else None
         self._elapsed_pause = 0
         self._time_paused = None
         self._running = start_immediately
         self._paused = False
 
-        self._laps = []
+        self._clear_laps()
         
     
 
+    def _clear_laps(self) -> None:
+
+        if self.max_laps is None:
+            self._laps = array("d")
+            self._lap_durations = array("d")
+        else:
+            self._laps = array("d", bytes(8 * self.max_laps))
+            self._lap_durations = array("d", bytes(8 * self.max_laps))
+
+        self._lap_head = 0
+        self._last_lap = 0
+
+        self._lap_count = 0
+        self._lap_mean = 0.0
+        self._lap_m2 = 0.0
+        self._lap_min = None
+        self._lap_max = None
+
+
+
     def lap(self) -> float:
         """
         Adds a new lap time.
         """
 
-        lap_time = self.get_time_elapsed()
-        self._laps.append(lap_time)
+        lap_ns = self.get_time_elapsed_ns()
+        lap_time = lap_ns / 1e9
+        duration = (lap_ns - self._last_lap) / 1e9
+        self._last_lap = lap_ns
+
+        if self.max_laps is None:
+            self._laps.append(lap_time)
+            self._lap_durations.append(duration)
+        else:
+            head = self._lap_head
+            self._laps[head] = lap_time
+            self._lap_durations[head] = duration
+            self._lap_head = (head + 1) % self.max_laps
+
+        # Welford's online mean and variance
+        self._lap_count += 1
+        delta = duration - self._lap_mean
+        self._lap_mean += delta / self._lap_count
+        self._lap_m2 += delta * (duration - self._lap_mean)
+
+        if self._lap_min is None or duration < self._lap_min:
+            self._lap_min = duration
+        if self._lap_max is None or duration > self._lap_max:
+            self._lap_max = duration
 
         return lap_time
     
 
 
+    def _ordered(self, laps:array) -> list:
+
+        if self.max_laps is None:
+            return laps.tolist()
+
+        if self._lap_count < self.max_laps:
+            return laps[:self._lap_count].tolist()
+
+        head = self._lap_head
+
+        return laps[head:].tolist() + laps[:head].tolist()
+
+
+
     def get_laps(self) -> list:
         """
-        Returns a list of all lap times.
+        Returns a list of the stored lap times, oldest first.
         """
 
-        return self._laps[:]
+        return self._ordered(self._laps)
     
 
 
     def get_lap_durations(self) -> list:
         """
-        Returns a list of the durations of each existing lap.
+        Returns a list of the durations of the stored laps, oldest first.
         """
 
-        durations = []
-        last = 0.0
+        return self._ordered(self._lap_durations)
 
-        for lap in self._laps:
-            durations.append(lap - last)
-            last = lap
-        
-        return durations
+
+
+    def get_last_lap_duration(self) -> float | None:
+        """
+        Returns the duration of the latest lap, None if there are no laps.
+        """
+
+        if not self._lap_count:
+            return None
+
+        if self.max_laps is None:
+            return self._lap_durations[-1]
+
+        return self._lap_durations[self._lap_head - 1]
+
+
+
+    def get_lap_stats(self) -> dict[str, float | int | None]:
+        """
+        Returns count, mean, variance (sample), min and max of the durations of every lap since the start, in O(1).
+        """
+
+        count = self._lap_count
+
+        return {
+            "count": count,
+            "mean": self._lap_mean if count else None,
+            "variance": self._lap_m2 / (count - 1) if count > 1 else 0.0,
+            "min": self._lap_min,
+            "max": self._lap_max,
+        }
     
 
 
@@ -164,18 +272,56 @@ class Stopwatch:
         Returns the time elapsed.
         """
 
+        return self.get_time_elapsed_ns() / 1e9
+
+
+
+    def get_time_elapsed_ns(self) -> int:
+        """
+        Returns the time elapsed in nanoseconds.
+        """
+
         if self._start_time is None:
-            return 0.0
+            return 0
 
         if self._paused:
             return self._time_paused - self._start_time - self._elapsed_pause
         elif self._running:
-            return time.time() - self._start_time - self._elapsed_pause
+            return self._now() - self._start_time - self._elapsed_pause
         else:
-            return 0.0
+            return 0
     
 
 
+    def set_precise(self, precise:bool) -> None:
+        """
+        Chooses between the clock's cached frame time and its current time.
+
+        precise : if True, reads the clock's current time on every query
+        """
+
+        self.precise = precise
+        self._now = self._clock.precise_now_ns if precise else self._clock.now_ns
+
+
+
+    def _set_clock(self, clock:FrameClock | VirtualClock | GroupClock) -> None:
+
+        # keeps elapsed and paused time, which are carried over as-is into the new clock's time
+        offset = -self._now()
+
+        self._clock = clock
+        self.set_precise(self.precise)
+
+        offset += self._now()
+
+        if self._start_time is not None:
+            self._start_time += offset
+        if self._time_paused is not None:
+            self._time_paused += offset
+
+
+
     def is_paused(self):
         """
         Returns True if paused, else False.
@@ -211,22 +357,160 @@ class Stopwatch:
 
 class StopwatchManager:
 
-    def __init__(self):
+    def __init__(self, clock:FrameClock | VirtualClock=None):
+        """
+        Stopwatches can be put in named groups running on a GroupClock, pausing or time-scaling a group is one
+        update to its clock. zone() gives nestable profiling zones backed by self.profiler.
+
+        clock : optional clock shared by all stopwatches of the manager, defaults to the default clock
+        """
         
+        self._clock = clock if clock is not None else get_default_clock()
+
         self._stopwatches = {}
+        self._groups = {}
+
+        self.profiler = Profiler(self._clock)
     
 
 
-    def create_new_stopwatch(self, stopwatch_id:str, start_immediately:bool=False) -> None:
+    def create_new_stopwatch(self, stopwatch_id:str, start_immediately:bool=False, precise:bool=False, group:str=None,
+                             max_laps:int=None) -> None:
         """
         Creates a new stopwatch.
 
         stopwatch_id : string id for stopwatch
         start_immediately : if True, stopwatch will start immediately
+        precise : if True, the stopwatch reads the clock's current time instead of the cached frame time
+        group : optional group id, the stopwatch then runs on the group's clock
+        max_laps : optional number of laps kept, see Stopwatch
         """
 
         if stopwatch_id not in self._stopwatches.keys():
-            self._stopwatches[stopwatch_id] = Stopwatch(start_immediately)
+            stopwatch = Stopwatch(start_immediately, self._get_group_clock(group), precise, max_laps)
+            stopwatch._group = group
+
+            self._stopwatches[stopwatch_id] = stopwatch
+
+
+
+    def _get_group_clock(self, group_id:str | None) -> FrameClock | VirtualClock | GroupClock:
+
+        if group_id is None:
+            return self._clock
+
+        if group_id not in self._groups:
+            raise KeyError(f"Stopwatch group '{group_id}' does not exist.")
+
+        return self._groups[group_id]
+
+
+
+    def create_group(self, group_id:str, scale:float=1.0, clock:GroupClock=None) -> GroupClock:
+        """
+        Creates a stopwatch group and returns its clock. Returns the existing clock if the group exists.
+
+        group_id : string id for the group
+        scale : initial time scale of the group
+        clock : optional GroupClock to run the group on, e.g. one returned by TimerManager.create_group
+        """
+
+        if group_id not in self._groups:
+            self._groups[group_id] = clock if clock is not None else GroupClock(self._clock, scale)
+
+        return self._groups[group_id]
+
+
+
+    def delete_group(self, group_id:str) -> None:
+        """
+        Deletes a stopwatch group. Its stopwatches move back to the manager's clock, keeping their elapsed time.
+
+        group_id : string id for the group
+        """
+
+        if group_id in self._groups:
+            for stopwatch in self._stopwatches.values():
+                if stopwatch._group == group_id:
+                    stopwatch._group = None
+                    stopwatch._set_clock(self._clock)
+
+            del self._groups[group_id]
+
+
+
+    def get_group(self, group_id:str) -> GroupClock:
+        """
+        Returns a group's clock.
+
+        group_id : string id for the group
+        """
+
+        if group_id not in self._groups:
+            raise KeyError(f"Stopwatch group '{group_id}' does not exist.")
+
+        return self._groups[group_id]
+
+
+
+    def set_stopwatch_group(self, stopwatch_id:str, group_id:str | None) -> None:
+        """
+        Moves a stopwatch into a group, or out of its group if group_id is None. Elapsed time is kept.
+
+        stopwatch_id : string id for stopwatch
+        group_id : group to move into, or None
+        """
+
+        stopwatch = self.get_stopwatch(stopwatch_id)
+        clock = self._get_group_clock(group_id)
+
+        if stopwatch._group != group_id:
+            stopwatch._group = group_id
+            stopwatch._set_clock(clock)
+
+
+
+    def pause_group(self, group_id:str) -> None:
+        """
+        Pauses every stopwatch of a group at once.
+
+        group_id : string id for the group
+        """
+
+        self.get_group(group_id).pause()
+
+
+
+    def resume_group(self, group_id:str) -> None:
+        """
+        Resumes every stopwatch of a group at once.
+
+        group_id : string id for the group
+        """
+
+        self.get_group(group_id).resume()
+
+
+
+    def set_group_scale(self, group_id:str, scale:float) -> None:
+        """
+        Sets how fast a group's stopwatches run, e.g. 0.5 for slow motion.
+
+        group_id : string id for the group
+        scale : group seconds per clock second
+        """
+
+        self.get_group(group_id).scale = scale
+
+
+
+    @property
+    def groups(self) -> dict[str, GroupClock]:
+        """
+        Returns a dictionary of all group clocks
+        """
+
+        return self._groups
 
         
 
@@ -412,9 +696,93 @@ class StopwatchManager:
         stopwatch = self.get_stopwatch(stopwatch_id)
 
         return stopwatch.get_lap_durations()
+
+
+
+    def get_lap_stats(self, stopwatch_id:str) -> dict[str, float | int | None]:
+        """
+        Returns the lap duration statistics of the specified stopwatch.
+
+        stopwatch_id : string id for stopwatch
+        """
+
+        stopwatch = self.get_stopwatch(stopwatch_id)
+
+        return stopwatch.get_lap_stats()
     
 
 
+    def zone(self, name:str) -> ZoneScope:
+        """
+        Returns a profiling zone, usable as a context manager or a decorator. Zones entered inside another zone
+        are recorded as its children.
+
+        name : zone name
+        """
+
+        return self.profiler.zone(name)
+
+
+
+    def end_frame(self) -> None:
+        """
+        Rolls up the profiling zones entered this frame. Add as a post-frame update.
+        """
+
+        self.profiler.end_frame()
+
+
+
+    def get_zone_stats(self, path:str) -> dict[str, float | int | None]:
+        """
+        Returns calls, total, mean, min, max, p50, p99, per-frame p50/p99 and last frame totals of a zone, in seconds.
+
+        path : zone names joined by "/", e.g. "update/render"
+        """
+
+        return self.profiler.get_zone_stats(path)
+
+
+
+    def get_zone(self, path:str) -> ProfileZone | None:
+        """
+        Returns a profiling zone's node, None if it was never entered.
+
+        path : zone names joined by "/"
+        """
+
+        return self.profiler.get_zone(path)
+
+
+
+    def dump_zones(self) -> str:
+        """
+        Returns a text table of all profiling zones.
+        """
+
+        return self.profiler.dump()
+
+
+
+    def export_zones(self, path:str=None) -> dict[str, dict]:
+        """
+        Returns the statistics of all profiling zones keyed by zone path, optionally writing them as JSON.
+
+        path : optional file to write
+        """
+
+        zones = self.profiler.export()
+
+        if path is not None:
+            import json
+
+            with open(path, "w") as file:
+                json.dump(zones, file, indent=4)
+
+        return zones
+
+
+
     def __contains__(self, stopwatch_id:str) -> bool:
 
         return stopwatch_id in self._stopwatches
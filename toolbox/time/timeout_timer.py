@@ -1,19 +1,69 @@
 
+import threading
 import time
 
+from collections import deque
+from collections.abc import Callable
+
+from .clock import FrameClock, GroupClock, VirtualClock, get_default_clock
+from .timer_schedulers import HeapScheduler, TimingWheelScheduler
+
+
+
+class _ThreadCallbackContext(threading.local):
+
+    # (call queue, timer) on a pool thread while a "thread" callback runs
+    current = None
+
+
+
+_thread_callback = _ThreadCallbackContext()
+
+
+
+def _queue_thread_call(function:Callable, *args) -> bool:
+
+    # timer and manager calls made inside a "thread" callback are applied by TimerManager.tick_all on the main thread
+    context = _thread_callback.current
+
+    if context is None:
+        return False
+
+    context[0].append((context[1], function, args))
+
+    return True
+
 
 
 
 
 class TimeoutTimer:
 
-    def __init__(self, duration:float, callback:callable=None, start_immediately:bool=False):
+    def __init__(self, duration:float, callback:callable=None, start_immediately:bool=False,
+                 clock:FrameClock | VirtualClock | GroupClock=None, precise:bool=False):
+        """
+        duration : duration in seconds
+        callback : optional callback on timeout
+        start_immediately : if True, starts timer immediately
+        clock : optional clock, defaults to the default clock
+        precise : if True, reads the clock's current time instead of the cached frame time
+        """
         
-        self.duration = duration
+        self._clock = clock if clock is not None else get_default_clock()
+        self.set_precise(precise)
+
+        self._duration = duration
         self.callback = callback
 
         self._timedout = False
 
+        # set by a TimerManager, told about every state change so it can reschedule the timer
+        self._scheduler = None
+        self._group = None
+
+        # "sync", or "thread" / "deferred" to have the TimerManager run the callback off the tick
+        self._dispatch = "sync"
+
         self._active = False
         self._start_time = None
         self._time_paused = None
@@ -29,6 +79,9 @@ class TimeoutTimer:
         Starts timer from zero
         """
 
+        if _queue_thread_call(self.start):
+            return
+
         if self._timedout:
             raise RuntimeError("Timer cannot be started while timedout. Use reset()")
         if self._time_paused is not None:
@@ -36,7 +89,9 @@ class TimeoutTimer:
 
         if not self._active:
             self._active = True
-            self._start_time = time.time()
+            self._start_time = self._now()
+
+            self._reschedule()
     
 
 
@@ -47,6 +102,9 @@ class TimeoutTimer:
         timeout : if True, calls self.timeout()
         """
 
+        if _queue_thread_call(self.stop, timeout):
+            return
+
         if self._timedout:
             raise RuntimeError("Timer cannot be stopped while timedout. Use reset()")
         
@@ -58,6 +116,8 @@ class TimeoutTimer:
         self._time_paused = None
         self._time_elapsed = 0
 
+        self._reschedule()
+
     
 
     def pause(self) -> None:
@@ -65,13 +125,19 @@ class TimeoutTimer:
         Pauses running timer, sets self._active to False.
         """
 
+        if _queue_thread_call(self.pause):
+            return
+
         if self._timedout:
             raise RuntimeError("Timer cannot be paused while timedout.")
         if self._time_paused is not None:
             raise RuntimeError("Timer cannot be paused while paused. Use resume()")
 
         self._active = False
-        self._time_paused = time.time()
+        self._time_paused = self._now()
+        self._time_elapsed = self._time_paused - self._start_time if self._start_time is not None else 0
+
+        self._reschedule()
     
 
     
@@ -80,13 +146,18 @@ class TimeoutTimer:
         Resumes paused timer.
         """
 
+        if _queue_thread_call(self.resume):
+            return
+
         if self._timedout:
             raise RuntimeError("Timer cannot be resumed while timedout. Use reset()")
 
         if self._time_paused is not None:
             self._active = True
-            self._start_time += (time.time() - self._time_paused)
+            self._start_time += (self._now() - self._time_paused)
             self._time_paused = None
+
+            self._reschedule()
         
     
 
@@ -97,13 +168,18 @@ class TimeoutTimer:
         start_immediately : if True, timer starts immediately
         """
 
+        if _queue_thread_call(self.reset, start_immediately):
+            return
+
         self._active = start_immediately
        
-        self._start_time = time.time() if start_immediately else None
+        self._start_time = self._now() if start_immediately else None
 
         self._timedout = False
         self._time_paused = None
         self._time_elapsed = 0
+
+        self._reschedule()
     
 
 
@@ -112,7 +188,79 @@ class TimeoutTimer:
         Returns elapsed time.
         """
 
+        if self._active:
+            return self._now() - self._start_time
+
         return self._time_elapsed
+
+
+
+    def get_deadline(self) -> float | None:
+        """
+        Returns the clock time the timer times out at, None if not active.
+        """
+
+        if not self._active:
+            return None
+
+        return self._start_time + self._duration
+
+
+
+    @property
+    def duration(self) -> float:
+        """
+        Timeout duration in seconds
+        """
+
+        return self._duration
+
+
+
+    @duration.setter
+    def duration(self, duration:float) -> None:
+
+        if _queue_thread_call(setattr, self, "duration", duration):
+            return
+
+        self._duration = duration
+        self._reschedule()
+
+
+
+    def set_precise(self, precise:bool) -> None:
+        """
+        Chooses between the clock's cached frame time and its current time.
+
+        precise : if True, reads the clock's current time on every query
+        """
+
+        self.precise = precise
+        self._now = self._clock.precise_now if precise else self._clock.now
+
+
+
+    def _set_clock(self, clock:FrameClock | VirtualClock | GroupClock) -> None:
+
+        # keeps elapsed and paused time, which are carried over as-is into the new clock's time
+        offset = -self._now()
+
+        self._clock = clock
+        self.set_precise(self.precise)
+
+        offset += self._now()
+
+        if self._start_time is not None:
+            self._start_time += offset
+        if self._time_paused is not None:
+            self._time_paused += offset
+
+
+
+    def _reschedule(self) -> None:
+
+        if self._scheduler is not None:
+            self._scheduler._timer_changed(self)
     
 
 
@@ -140,11 +288,17 @@ class TimeoutTimer:
         """
 
         if self._active:
-            current = time.time()
+            current = self._now()
             self._time_elapsed = current - self._start_time
 
             if self._time_elapsed >= self.duration:
-                self.timeout()
+                self._expire(current)
+
+
+
+    def _expire(self, current:float) -> None:
+
+        self.timeout()
     
 
 
@@ -153,6 +307,9 @@ class TimeoutTimer:
         Timesout timer.
         """
 
+        if _queue_thread_call(self.timeout):
+            return
+
         self._timedout = True
 
         self._active = False
@@ -160,15 +317,145 @@ class TimeoutTimer:
         self._time_paused = None
         self._time_elapsed = 0
 
+        self._reschedule()
+
         if self.callback is not None:
-            self.callback()
+            self._run_callback(1)
+
+
+
+    def _run_callback(self, expirations:int) -> None:
+
+        if self._dispatch == "sync":
+            self._invoke_callback(expirations)
+        else:
+            self._scheduler._dispatch_callback(self, expirations)
+
+
+
+    def _invoke_callback(self, expirations:int) -> None:
+
+        self.callback()
     
 
 
     def __repr__(self):
 
         return (f"<TimeoutTimer active={self._active} timedout={self._timedout} "
-                f"time_elapsed={self._time_elapsed:.2f}/{self.duration}>")
+                f"time_elapsed={self.get_time_elapsed():.2f}/{self.duration}>")
+
+
+
+
+
+class IntervalTimer(TimeoutTimer):
+
+    CATCH_UP_POLICIES = ("all", "once", "skip")
+
+    def __init__(self, interval:float, callback:Callable[[int], None]=None, start_immediately:bool=False, catch_up:str="once",
+                 clock:FrameClock | VirtualClock | GroupClock=None, precise:bool=False):
+        """
+        Repeating timer. Each deadline is the previous deadline plus the interval, so late ticks do not accumulate drift.
+        The callback is passed the number of periods it accounts for.
+
+        interval : period in seconds
+        callback : optional callable, passed an expiry count
+        start_immediately : if True, starts timer immediately
+        catch_up : how periods missed during a long frame are delivered:
+                   "all" calls the callback once per period with 1, "once" calls it once with the number of periods,
+                   "skip" calls it once with 1 and drops the missed periods
+        clock : optional clock, defaults to the default clock
+        precise : if True, reads the clock's current time instead of the cached frame time
+        """
+
+        if interval <= 0:
+            raise ValueError("Interval must be greater than 0")
+        if catch_up not in self.CATCH_UP_POLICIES:
+            raise ValueError(f"catch_up must be one of {self.CATCH_UP_POLICIES}, not '{catch_up}'")
+
+        self.catch_up = catch_up
+        self._expirations = 0
+
+        super().__init__(interval, callback, start_immediately, clock, precise)
+
+
+
+    @property
+    def interval(self) -> float:
+        """
+        Period in seconds
+        """
+
+        return self._duration
+
+
+
+    @interval.setter
+    def interval(self, interval:float) -> None:
+
+        if interval <= 0:
+            raise ValueError("Interval must be greater than 0")
+
+        self.duration = interval
+
+
+
+    def get_expirations(self) -> int:
+        """
+        Returns the number of periods elapsed since the timer was started or reset, including skipped ones.
+        """
+
+        return self._expirations
+
+
+
+    def reset(self, start_immediately:bool=False) -> None:
+        """
+        Reset timer to zero.
+
+        start_immediately : if True, timer starts immediately
+        """
+
+        if _queue_thread_call(self.reset, start_immediately):
+            return
+
+        self._expirations = 0
+
+        super().reset(start_immediately)
+
+
+
+    def _expire(self, current:float) -> None:
+
+        # deadlines stay on the grid start + k * interval regardless of when the tick happens
+        expirations = int((current - self._start_time) // self._duration)
+
+        self._start_time += expirations * self._duration
+        self._expirations += expirations
+
+        self._reschedule()
+
+        if self.callback is not None:
+            self._run_callback(expirations)
+
+
+
+    def _invoke_callback(self, expirations:int) -> None:
+
+        if self.catch_up == "all":
+            for _ in range(expirations):
+                self.callback(1)
+        elif self.catch_up == "once":
+            self.callback(expirations)
+        else:
+            self.callback(1)
+
+
+
+    def __repr__(self):
+
+        return (f"<IntervalTimer active={self._active} interval={self.interval} "
+                f"time_elapsed={self.get_time_elapsed():.2f} expirations={self._expirations}>")
 
 
 
@@ -176,13 +463,62 @@ class TimeoutTimer:
 
 class TimerManager:
 
-    def __init__(self):
+    DISPATCH_MODES = ("sync", "thread", "deferred")
+
+    def __init__(self, scheduler:HeapScheduler | TimingWheelScheduler=None, clock:FrameClock | VirtualClock=None, workers:int=2,
+                 deferred_budget:float=0.002, on_error:Callable[[str | None, BaseException], None]=None):
+        """
+        Timers can be put in named groups. Each group runs on its own GroupClock with its own scheduler holding
+        deadlines in group time, so pausing or time-scaling a group is one update to its clock.
+
+        Callbacks run synchronously by default. A timer created with dispatch="thread" runs its callback on a thread
+        pool, one created with dispatch="deferred" queues it to be run by tick_all within deferred_budget seconds per
+        frame. Exceptions from both are caught and reported through on_error on the main thread, or kept for
+        get_failures() when on_error is None. The timer itself always times out or advances during the tick.
+
+        Thread callbacks: a timer has at most one callback running on the pool, expiries while it runs are merged
+        into one follow-up call passed their total count. Timer methods and TimerManager methods that change timers
+        or groups, called inside the callback, are queued and applied in order by the next tick_all on the main
+        thread, so they do not show in queries made later in the same callback and their exceptions are reported
+        like the callback's. Any other state the callback shares with the game must be synchronized by the callback.
+
+        scheduler : deadline scheduler, defaults to a HeapScheduler. TimingWheelScheduler suits very large timer counts
+        clock : optional clock shared by all timers of the manager, defaults to the default clock
+        workers : number of threads for "thread" callbacks, started on first use
+        deferred_budget : seconds per tick spent on "deferred" callbacks, at least one runs per tick
+        on_error : optional callable, passed the timer id (None if deleted since) and the exception of a failed callback
+        """
         
+        self._clock = clock if clock is not None else get_default_clock()
+
         self._timers = {}
+
+        self._scheduler = scheduler if scheduler is not None else HeapScheduler()
+
+        # group id : (GroupClock, scheduler)
+        self._groups = {}
+        self._group_list = ()
+
+        self.workers = workers
+        self.deferred_budget = deferred_budget
+        self.on_error = on_error
+
+        self._executor = None
+
+        # timer : expirations waiting for its running thread callback to finish
+        self._thread_running = {}
+
+        # (timer, future) and (timer, function, args) appended by pool threads, (timer, expirations) waiting for a deferred run
+        self._completed = deque()
+        self._thread_calls = deque()
+        self._deferred = deque()
+
+        self._failures = deque(maxlen=100)
     
 
 
-    def create_timer(self, timer_id:str, duration:float, callback:callable=None, start_immediately:bool=False) -> None:
+    def create_timer(self, timer_id:str, duration:float, callback:callable=None, start_immediately:bool=False, precise:bool=False,
+                     group:str=None, dispatch:str="sync") -> None:
         """
         Creates new timer.
 
@@ -190,10 +526,26 @@ class TimerManager:
         duration : duration in seconds for new timer
         callback : optional callback on timeout
         start_immediately : if True, starts new timer immediately
+        precise : if True, the timer reads the clock's current time instead of the cached frame time
+        group : optional group id, the timer then runs on the group's clock
+        dispatch : "sync", "thread" or "deferred", see TimerManager
         """
 
+        if _queue_thread_call(self.create_timer, timer_id, duration, callback, start_immediately, precise, group, dispatch):
+            return
+
         if timer_id not in self._timers.keys():
-            self._timers[timer_id] = TimeoutTimer(duration, callback, start_immediately)
+            self._check_dispatch(dispatch)
+
+            timer = TimeoutTimer(duration, callback, clock=self._get_group_clock(group), precise=precise)
+            timer._scheduler = self
+            timer._group = group
+            timer._dispatch = dispatch
+
+            self._timers[timer_id] = timer
+
+            if start_immediately:
+                timer.start()
         
     
 
@@ -204,22 +556,459 @@ class TimerManager:
         timer_id : timer to delete
         """
 
+        if _queue_thread_call(self.delete_timer, timer_id):
+            return
+
         if timer_id in self._timers.keys():
-            del self._timers[timer_id]
+            timer = self._timers.pop(timer_id)
+            self._get_scheduler(timer).cancel(timer)
+
+            # queued deferred callbacks of the timer are dropped
+            timer._scheduler = None
+            timer._dispatch = "sync"
     
 
     
+    def create_interval_timer(self, timer_id:str, interval:float, callback:Callable[[int], None]=None, start_immediately:bool=False,
+                              catch_up:str="once", precise:bool=False, group:str=None, dispatch:str="sync") -> None:
+        """
+        Creates new repeating timer.
+
+        timer_id : string id for new timer
+        interval : period in seconds
+        callback : optional callback on each expiry, passed an expiry count
+        start_immediately : if True, starts new timer immediately
+        catch_up : "all", "once" or "skip", see IntervalTimer
+        precise : if True, the timer reads the clock's current time instead of the cached frame time
+        group : optional group id, the timer then runs on the group's clock
+        dispatch : "sync", "thread" or "deferred", see TimerManager
+        """
+
+        if _queue_thread_call(self.create_interval_timer, timer_id, interval, callback, start_immediately, catch_up, precise, group,
+                              dispatch):
+            return
+
+        if timer_id not in self._timers.keys():
+            self._check_dispatch(dispatch)
+
+            timer = IntervalTimer(interval, callback, catch_up=catch_up, clock=self._get_group_clock(group), precise=precise)
+            timer._scheduler = self
+            timer._group = group
+            timer._dispatch = dispatch
+
+            self._timers[timer_id] = timer
+
+            if start_immediately:
+                timer.start()
+
+
+
     def tick_all(self) -> None:
         """
-        Ticks all timers.
+        Times out every timer whose deadline has passed. Only expired timers are touched, paused groups are skipped.
+        Also applies calls queued by thread callbacks, reports finished thread callbacks and runs deferred callbacks.
+        """
+
+        if self._completed:
+            self._drain_completed()
+
+        if self._thread_calls:
+            self._apply_thread_calls()
+
+        if len(self._scheduler):
+            self._tick_scheduler(self._scheduler, self._clock)
+
+        for clock, scheduler in self._group_list:
+            if len(scheduler) and not clock._paused:
+                self._tick_scheduler(scheduler, clock)
+
+        if self._deferred:
+            self._drain_deferred()
+
+
+
+    def _tick_scheduler(self, scheduler:HeapScheduler | TimingWheelScheduler, clock:FrameClock | VirtualClock | GroupClock) -> None:
+
+        current = clock.now()
+
+        # callbacks run after popping so a timer restarted by its callback waits for the next tick,
+        # and a timer changed or deleted by an earlier callback this tick is skipped
+        for timer in scheduler.pop_expired(current):
+            if (timer._active and timer._scheduler is self and timer._clock is clock
+                    and timer._start_time + timer._duration <= current):
+                timer._expire(current)
+
+
+
+    def _timer_changed(self, timer:TimeoutTimer) -> None:
+
+        scheduler = self._get_scheduler(timer)
+
+        if timer._active:
+            scheduler.schedule(timer, timer._start_time + timer._duration, timer._clock.now())
+        else:
+            scheduler.cancel(timer)
+
+
+
+    def _check_dispatch(self, dispatch:str) -> None:
+
+        if dispatch not in self.DISPATCH_MODES:
+            raise ValueError(f"dispatch must be one of {self.DISPATCH_MODES}, not '{dispatch}'")
+
+
+
+    def set_dispatch(self, timer_id:str, dispatch:str) -> None:
+        """
+        Changes where a timer's callback runs.
+
+        timer_id : timer to change
+        dispatch : "sync", "thread" or "deferred", see TimerManager
         """
 
-        for timers in self._timers.values():
+        if _queue_thread_call(self.set_dispatch, timer_id, dispatch):
+            return
+
+        timer = self.get_timer(timer_id)
+
+        if timer is None:
+            raise ValueError(f"Timer '{timer_id}' not found")
+
+        self._check_dispatch(dispatch)
+
+        timer._dispatch = dispatch
+
+
+
+    def _dispatch_callback(self, timer:TimeoutTimer, expirations:int) -> None:
+
+        if timer._dispatch == "thread":
+            running = self._thread_running
+
+            # one callback per timer on the pool, expiries meanwhile wait for it to finish
+            if timer in running:
+                running[timer] += expirations
+            else:
+                running[timer] = 0
+                self._submit(timer, expirations)
+        else:
+            self._deferred.append((timer, expirations))
+
+
+
+    def _submit(self, timer:TimeoutTimer, expirations:int) -> None:
+
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="toolbox-timers")
+
+        future = self._executor.submit(self._run_thread_callback, timer, expirations)
+        future.add_done_callback(lambda done: self._completed.append((timer, done)))
+
+
+
+    def _run_thread_callback(self, timer:TimeoutTimer, expirations:int) -> None:
+
+        _thread_callback.current = (self._thread_calls, timer)
+
+        try:
+            timer._invoke_callback(expirations)
+        finally:
+            _thread_callback.current = None
+
+
+
+    def _apply_thread_calls(self) -> None:
+
+        calls = self._thread_calls
+
+        while calls:
+            timer, function, args = calls.popleft()
+
+            try:
+                function(*args)
+            except Exception as exception:
+                self._report_failure(timer, exception)
+
+
+
+    def _drain_completed(self, resubmit:bool=True) -> None:
+
+        completed = self._completed
+        running = self._thread_running
+
+        finished = []
+
+        while completed:
+            timer, future = completed.popleft()
+
+            if not future.cancelled() and future.exception() is not None:
+                self._report_failure(timer, future.exception())
+
+            finished.append(timer)
+
+        # a finished callback queued its calls before completing, they are applied before it can run again
+        self._apply_thread_calls()
+
+        for timer in finished:
+            expirations = running.pop(timer, 0)
+
+            # expiries merged while the callback ran, dropped if the timer was deleted or switched away from "thread"
+            if resubmit and expirations and timer._scheduler is self and timer._dispatch == "thread":
+                running[timer] = 0
+                self._submit(timer, expirations)
 
-            timers.tick()
+
+
+    def _drain_deferred(self) -> None:
+
+        deferred = self._deferred
+        end = time.perf_counter() + self.deferred_budget
+
+        while deferred:
+            timer, expirations = deferred.popleft()
+
+            if timer._scheduler is self:
+                try:
+                    timer._invoke_callback(expirations)
+                except Exception as exception:
+                    self._report_failure(timer, exception)
+
+            if time.perf_counter() >= end:
+                break
+
+
+
+    def _report_failure(self, timer:TimeoutTimer, exception:BaseException) -> None:
+
+        timer_id = next((timer_id for timer_id, t in self._timers.items() if t is timer), None)
+
+        if self.on_error is not None:
+            self.on_error(timer_id, exception)
+        else:
+            self._failures.append((timer_id, exception))
+
+
+
+    def get_failures(self) -> list[tuple[str | None, BaseException]]:
+        """
+        Returns and clears the (timer id, exception) pairs of failed off-loop callbacks not passed to on_error.
+        Only the latest 100 are kept.
+        """
+
+        failures = list(self._failures)
+        self._failures.clear()
+
+        return failures
+
+
+
+    def get_pending_callback_count(self) -> int:
+        """
+        Returns the number of off-loop callbacks running on the thread pool or waiting in the deferred queue.
+        """
+
+        return len(self._thread_running) + len(self._deferred)
+
+
+
+    def shutdown(self, wait:bool=True) -> None:
+        """
+        Stops the callback threads, applies the calls they queued and reports their outcome. Deferred callbacks and
+        expiries waiting for a running thread callback are dropped.
+
+        wait : if True, waits for running thread callbacks to finish
+        """
+
+        running = self._thread_running
+
+        for timer in running:
+            running[timer] = 0
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=not wait)
+            self._executor = None
+
+        self._drain_completed(resubmit=False)
+        self._deferred.clear()
+
+
+
+    def _get_scheduler(self, timer:TimeoutTimer) -> HeapScheduler | TimingWheelScheduler:
+
+        return self._scheduler if timer._group is None else self._groups[timer._group][1]
+
+
+
+    def _get_group_clock(self, group_id:str | None) -> FrameClock | VirtualClock | GroupClock:
+
+        if group_id is None:
+            return self._clock
+
+        if group_id not in self._groups:
+            raise ValueError(f"Timer group '{group_id}' not found")
+
+        return self._groups[group_id][0]
+
+
+
+    def create_group(self, group_id:str, scale:float=1.0, clock:GroupClock=None) -> GroupClock:
+        """
+        Creates a timer group and returns its clock. Returns the existing clock if the group exists.
+
+        group_id : string id for the group
+        scale : initial time scale of the group
+        clock : optional GroupClock to run the group on, e.g. one shared with a StopwatchManager group
+        """
+
+        if group_id in self._groups:
+            return self._groups[group_id][0]
+
+        if clock is None:
+            clock = GroupClock(self._clock, scale)
+
+        # a fresh scheduler configured like the manager's, deadlines in a group are in group time
+        self._groups[group_id] = (clock, self._scheduler.clone())
+        self._group_list = tuple(self._groups.values())
+
+        return clock
+
+
+
+    def delete_group(self, group_id:str) -> None:
+        """
+        Deletes a timer group. Its timers move back to the manager's clock, keeping their elapsed time.
+
+        group_id : group to delete
+        """
+
+        if _queue_thread_call(self.delete_group, group_id):
+            return
+
+        if group_id not in self._groups:
+            return
+
+        for timer in self._timers.values():
+            if timer._group == group_id:
+                self._move_timer(timer, None)
+
+        del self._groups[group_id]
+        self._group_list = tuple(self._groups.values())
+
+
+
+    def get_group(self, group_id:str) -> GroupClock:
+        """
+        Returns a group's clock.
+
+        group_id : group to return
+        """
+
+        if group_id not in self._groups:
+            raise ValueError(f"Timer group '{group_id}' not found")
+
+        return self._groups[group_id][0]
+
+
+
+    def set_timer_group(self, timer_id:str, group_id:str | None) -> None:
+        """
+        Moves a timer into a group, or out of its group if group_id is None. Elapsed time is kept.
+
+        timer_id : timer to move
+        group_id : group to move into, or None
+        """
+
+        if _queue_thread_call(self.set_timer_group, timer_id, group_id):
+            return
+
+        timer = self.get_timer(timer_id)
+
+        if timer is None:
+            raise ValueError(f"Timer '{timer_id}' not found")
+
+        self._get_group_clock(group_id)
+
+        if timer._group != group_id:
+            self._move_timer(timer, group_id)
+
+
+
+    def _move_timer(self, timer:TimeoutTimer, group_id:str | None) -> None:
+
+        self._get_scheduler(timer).cancel(timer)
+
+        timer._group = group_id
+        timer._set_clock(self._get_group_clock(group_id))
+
+        self._timer_changed(timer)
+
+
+
+    def pause_group(self, group_id:str) -> None:
+        """
+        Pauses every timer of a group at once.
+
+        group_id : group to pause
+        """
+
+        if _queue_thread_call(self.pause_group, group_id):
+            return
+
+        self._get_group_clock(group_id).pause()
+
+
+
+    def resume_group(self, group_id:str) -> None:
+        """
+        Resumes every timer of a group at once.
+
+        group_id : group to resume
+        """
+
+        if _queue_thread_call(self.resume_group, group_id):
+            return
+
+        self._get_group_clock(group_id).resume()
+
+
+
+    def set_group_scale(self, group_id:str, scale:float) -> None:
+        """
+        Sets how fast a group's timers run, e.g. 0.5 for slow motion.
+
+        group_id : group to scale
+        scale : group seconds per clock second
+        """
+
+        if _queue_thread_call(self.set_group_scale, group_id, scale):
+            return
+
+        self._get_group_clock(group_id).scale = scale
+
+
+
+    @property
+    def groups(self) -> dict[str, GroupClock]:
+        """
+        Group clock dictionary
+        """
+
+        return {group_id: clock for group_id, (clock, _) in self._groups.items()}
     
 
 
+    @property
+    def clock(self) -> FrameClock | VirtualClock:
+        """
+        Clock shared by all timers
+        """
+
+        return self._clock
+
+
+
     @property
     def timers(self) -> dict[str, TimeoutTimer]:
         """
@@ -252,6 +1041,40 @@ class TimerManager:
     
 
 
+    def get_time_until_next_timeout(self) -> float | None:
+        """
+        Returns the seconds until the earliest active timer times out, 0 if one is overdue or deferred callbacks
+        are waiting, else None. Timers in paused or stopped groups are not counted.
+        """
+
+        if self._deferred:
+            return 0.0
+
+        earliest = None
+        deadline = self._scheduler.next_deadline()
+
+        if deadline is not None:
+            earliest = deadline - self._clock.precise_now()
+
+        for clock, scheduler in self._group_list:
+            if not len(scheduler) or clock._paused or clock._scale == 0:
+                continue
+
+            deadline = scheduler.next_deadline()
+
+            if deadline is not None:
+                remaining = (deadline - clock.precise_now()) / clock._scale
+
+                if earliest is None or remaining < earliest:
+                    earliest = remaining
+
+        if earliest is None:
+            return None
+
+        return max(earliest, 0.0)
+
+
+
     def get_all_active(self) -> dict[str, TimeoutTimer]:
         """
         Returns all active timers.
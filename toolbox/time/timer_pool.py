@@ -0,0 +1,492 @@
+
+from collections.abc import Callable
+
+import numpy as np
+
+from .clock import FrameClock, GroupClock, VirtualClock, get_default_clock
+
+
+
+# state flags
+_ALLOCATED = 1
+_ACTIVE = 2
+_PAUSED = 4
+_TIMEDOUT = 8
+
+
+
+
+
+class TimerPool:
+
+    def __init__(self, capacity:int=1024, callback:Callable[[np.ndarray], None]=None, clock:FrameClock | VirtualClock | GroupClock=None):
+        """
+        Struct-of-arrays storage for large numbers of one-shot timers, e.g. per-entity cooldowns. Timers are slots
+        in NumPy arrays addressed by index, every operation takes one index or an array of indices, and tick()
+        times out all due timers with one vectorized comparison.
+
+        capacity : initial number of slots, grows by doubling
+        callback : optional callable, passed the array of indices that timed out on each tick
+        clock : optional clock, defaults to the default clock
+        """
+
+        self.callback = callback
+
+        self._clock = clock if clock is not None else get_default_clock()
+
+        self._start = np.zeros(capacity, dtype=np.float64)
+        self._duration = np.zeros(capacity, dtype=np.float64)
+        self._paused_at = np.zeros(capacity, dtype=np.float64)
+        self._state = np.zeros(capacity, dtype=np.uint8)
+
+        # start + duration while active, inf otherwise, so tick() needs a single comparison
+        self._deadline = np.full(capacity, np.inf, dtype=np.float64)
+        self._expired = np.zeros(capacity, dtype=np.bool_)
+
+        self._count = 0
+        self._high = 0
+        self._free = []
+
+
+
+    def create(self, duration:float, start_immediately:bool=False) -> "TimerHandle":
+        """
+        Creates a timer and returns a handle to it. Slots of removed timers are reused.
+
+        duration : duration in seconds
+        start_immediately : if True, starts the timer immediately
+        """
+
+        if self._free:
+            index = self._free.pop()
+        else:
+            if self._high == len(self._state):
+                self._grow(max(self._high * 2, 1))
+
+            index = self._high
+            self._high += 1
+
+        self._count += 1
+
+        self._duration[index] = duration
+        self._state[index] = _ALLOCATED
+        self._deadline[index] = np.inf
+
+        if start_immediately:
+            self.start(index)
+
+        return TimerHandle(self, index)
+
+
+
+    def create_many(self, durations:np.ndarray, start_immediately:bool=False) -> np.ndarray:
+        """
+        Creates one timer per duration and returns their indices. New slots are appended, freed slots are not reused.
+
+        durations : array of durations in seconds
+        start_immediately : if True, starts the timers immediately
+        """
+
+        durations = np.asarray(durations, dtype=np.float64)
+        count = len(durations)
+
+        if self._high + count > len(self._state):
+            self._grow(max(len(self._state) * 2, self._high + count))
+
+        indices = np.arange(self._high, self._high + count)
+        self._high += count
+        self._count += count
+
+        self._duration[indices] = durations
+        self._state[indices] = _ALLOCATED
+        self._deadline[indices] = np.inf
+
+        if start_immediately:
+            self.start(indices)
+
+        return indices
+
+
+
+    def remove(self, index:int) -> None:
+        """
+        Frees a timer's slot. Handles to it must not be used afterwards.
+
+        index : timer to remove
+        """
+
+        if not self._state[index] & _ALLOCATED:
+            raise ValueError(f"Timer slot {index} is not in use")
+
+        self._state[index] = 0
+        self._deadline[index] = np.inf
+
+        self._count -= 1
+        self._free.append(index)
+
+
+
+    def _grow(self, capacity:int) -> None:
+
+        for name, fill in (("_start", 0), ("_duration", 0), ("_paused_at", 0), ("_state", 0), ("_deadline", np.inf), ("_expired", False)):
+            array = getattr(self, name)
+            grown = np.full(capacity, fill, dtype=array.dtype)
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+
+
+    def start(self, indices:int | np.ndarray) -> None:
+        """
+        Starts timers from zero. Unlike TimeoutTimer, running and timed out timers are restarted.
+
+        indices : index or array of indices
+        """
+
+        current = self._clock.now()
+
+        self._start[indices] = current
+        self._deadline[indices] = current + self._duration[indices]
+        self._state[indices] = _ALLOCATED | _ACTIVE
+
+
+
+    def stop(self, indices:int | np.ndarray) -> None:
+        """
+        Stops timers and resets them without timing out.
+
+        indices : index or array of indices
+        """
+
+        self._deadline[indices] = np.inf
+        self._state[indices] = _ALLOCATED
+
+
+
+    reset = stop
+
+
+
+    def pause(self, indices:int | np.ndarray) -> None:
+        """
+        Pauses running timers, others are left as they are.
+
+        indices : index or array of indices
+        """
+
+        indices = self._select(indices, _ACTIVE)
+
+        self._paused_at[indices] = self._clock.now()
+        self._deadline[indices] = np.inf
+        self._state[indices] = _ALLOCATED | _PAUSED
+
+
+
+    def resume(self, indices:int | np.ndarray) -> None:
+        """
+        Resumes paused timers, others are left as they are.
+
+        indices : index or array of indices
+        """
+
+        indices = self._select(indices, _PAUSED)
+
+        self._start[indices] += self._clock.now() - self._paused_at[indices]
+        self._deadline[indices] = self._start[indices] + self._duration[indices]
+        self._state[indices] = _ALLOCATED | _ACTIVE
+
+
+
+    def _select(self, indices:int | np.ndarray, flag:int) -> np.ndarray:
+
+        indices = np.atleast_1d(indices)
+
+        return indices[(self._state[indices] & flag) != 0]
+
+
+
+    def set_duration(self, indices:int | np.ndarray, durations:float | np.ndarray) -> None:
+        """
+        Changes timer durations. Running timers keep their elapsed time.
+
+        indices : index or array of indices
+        durations : duration or array of durations in seconds
+        """
+
+        self._duration[indices] = durations
+
+        active = self._select(indices, _ACTIVE)
+        self._deadline[active] = self._start[active] + self._duration[active]
+
+
+
+    def tick(self) -> np.ndarray:
+        """
+        Times out every running timer whose deadline has passed and returns their indices.
+        """
+
+        high = self._high
+
+        if not high:
+            return np.empty(0, dtype=np.intp)
+
+        expired = self._expired[:high]
+        np.less_equal(self._deadline[:high], self._clock.now(), out=expired)
+
+        indices = np.flatnonzero(expired)
+
+        if len(indices):
+            self._deadline[indices] = np.inf
+            self._state[indices] = _ALLOCATED | _TIMEDOUT
+
+            if self.callback is not None:
+                self.callback(indices)
+
+        return indices
+
+
+
+    def get_time_elapsed(self, indices:int | np.ndarray) -> float | np.ndarray:
+        """
+        Returns elapsed times, 0 for timers that are not running or paused.
+
+        indices : index or array of indices
+        """
+
+        state = self._state[indices]
+        start = self._start[indices]
+
+        return np.where(state & _ACTIVE, self._clock.now() - start,
+                        np.where(state & _PAUSED, self._paused_at[indices] - start, 0.0))
+
+
+
+    def get_time_remaining(self, indices:int | np.ndarray) -> float | np.ndarray:
+        """
+        Returns remaining times, clamped to 0.
+
+        indices : index or array of indices
+        """
+
+        return np.maximum(self._duration[indices] - self.get_time_elapsed(indices), 0.0)
+
+
+
+    def is_active(self, indices:int | np.ndarray) -> bool | np.ndarray:
+        """
+        Returns True for running timers.
+
+        indices : index or array of indices
+        """
+
+        return (self._state[indices] & _ACTIVE) != 0
+
+
+
+    def is_paused(self, indices:int | np.ndarray) -> bool | np.ndarray:
+        """
+        Returns True for paused timers.
+
+        indices : index or array of indices
+        """
+
+        return (self._state[indices] & _PAUSED) != 0
+
+
+
+    def is_timedout(self, indices:int | np.ndarray) -> bool | np.ndarray:
+        """
+        Returns True for timed out timers. Cleared by start(), stop() and reset().
+
+        indices : index or array of indices
+        """
+
+        return (self._state[indices] & _TIMEDOUT) != 0
+
+
+
+    def get_handle(self, index:int) -> "TimerHandle":
+        """
+        Returns a handle to a timer.
+
+        index : timer to return
+        """
+
+        if not self._state[index] & _ALLOCATED:
+            raise ValueError(f"Timer slot {index} is not in use")
+
+        return TimerHandle(self, index)
+
+
+
+    @property
+    def durations(self) -> np.ndarray:
+        """
+        View of the duration column over all slots, unused slots included
+        """
+
+        return self._duration[:self._high]
+
+
+
+    @property
+    def clock(self) -> FrameClock | VirtualClock | GroupClock:
+        """
+        Clock shared by all timers
+        """
+
+        return self._clock
+
+
+
+    def __len__(self) -> int:
+
+        return self._count
+
+
+
+    def __repr__(self) -> str:
+
+        active = int(np.count_nonzero(self._state[:self._high] & _ACTIVE))
+
+        return f"<TimerPool timers={self._count} active={active} capacity={len(self._state)}>"
+
+
+
+
+
+class TimerHandle:
+
+    __slots__ = ("pool", "index")
+
+    def __init__(self, pool:TimerPool, index:int):
+        """
+        Single-timer view into a TimerPool with the TimeoutTimer query methods. Holds no state of its own.
+
+        pool : pool holding the timer
+        index : slot of the timer
+        """
+
+        self.pool = pool
+        self.index = index
+
+
+
+    def start(self) -> None:
+        """
+        Starts timer from zero
+        """
+
+        self.pool.start(self.index)
+
+
+
+    def stop(self) -> None:
+        """
+        Stops and resets the timer without timing out
+        """
+
+        self.pool.stop(self.index)
+
+
+
+    reset = stop
+
+
+
+    def pause(self) -> None:
+        """
+        Pauses the timer if running.
+        """
+
+        self.pool.pause(self.index)
+
+
+
+    def resume(self) -> None:
+        """
+        Resumes the timer if paused.
+        """
+
+        self.pool.resume(self.index)
+
+
+
+    @property
+    def duration(self) -> float:
+        """
+        Timeout duration in seconds
+        """
+
+        return float(self.pool._duration[self.index])
+
+
+
+    @duration.setter
+    def duration(self, duration:float) -> None:
+
+        self.pool.set_duration(self.index, duration)
+
+
+
+    def get_time_elapsed(self) -> float:
+        """
+        Returns elapsed time.
+        """
+
+        return float(self.pool.get_time_elapsed(self.index))
+
+
+
+    def get_time_remaining(self) -> float:
+        """
+        Returns remaining time.
+        """
+
+        return float(self.pool.get_time_remaining(self.index))
+
+
+
+    def is_active(self) -> bool:
+        """
+        Returns True if active.
+        """
+
+        return bool(self.pool._state[self.index] & _ACTIVE)
+
+
+
+    def is_paused(self) -> bool:
+        """
+        Returns True if paused.
+        """
+
+        return bool(self.pool._state[self.index] & _PAUSED)
+
+
+
+    def is_timedout(self) -> bool:
+        """
+        Returns True if timedout.
+        """
+
+        return bool(self.pool._state[self.index] & _TIMEDOUT)
+
+
+
+    def __eq__(self, other:object) -> bool:
+
+        return isinstance(other, TimerHandle) and other.pool is self.pool and other.index == self.index
+
+
+
+    def __hash__(self) -> int:
+
+        return hash((id(self.pool), self.index))
+
+
+
+    def __repr__(self) -> str:
+
+        return (f"<TimerHandle index={self.index} active={self.is_active()} timedout={self.is_timedout()} "
+                f"time_elapsed={self.get_time_elapsed():.2f}/{self.duration}>")
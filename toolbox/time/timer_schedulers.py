@@ -0,0 +1,389 @@
+
+import heapq
+import itertools
+import math
+
+
+
+_NO_TIMERS = ()
+
+
+
+
+
+class HeapScheduler:
+
+    def __init__(self):
+        """
+        Deadline min-heap. O(log n) schedule, O(1) cancel by lazy invalidation, tick cost proportional to expirations.
+        """
+
+        # (deadline, sequence, timer); an entry is live while its sequence matches _live[timer]
+        self._heap = []
+        self._live = {}
+        self._sequence = itertools.count()
+
+
+
+    def schedule(self, timer:object, deadline:float, current:float) -> None:
+        """
+        Schedules a timer, replacing its previous deadline if it had one.
+
+        timer : timer to schedule
+        deadline : clock time the timer expires at
+        current : current clock time
+        """
+
+        heap = self._heap
+
+        # drop stale entries once they outnumber live ones
+        if len(heap) > 2 * len(self._live) + 64:
+            heap[:] = [entry for entry in heap if self._live.get(entry[2]) == entry[1]]
+            heapq.heapify(heap)
+
+        sequence = next(self._sequence)
+        self._live[timer] = sequence
+
+        heapq.heappush(heap, (deadline, sequence, timer))
+
+
+
+    def cancel(self, timer:object) -> None:
+        """
+        Unschedules a timer.
+
+        timer : timer to cancel
+        """
+
+        self._live.pop(timer, None)
+
+
+
+    def pop_expired(self, current:float) -> list:
+        """
+        Removes and returns all timers with a deadline at or before current, in deadline order.
+
+        current : current clock time
+        """
+
+        heap = self._heap
+
+        if not heap or heap[0][0] > current:
+            return _NO_TIMERS
+
+        live = self._live
+        expired = []
+
+        while heap and heap[0][0] <= current:
+            _, sequence, timer = heapq.heappop(heap)
+
+            if live.get(timer) == sequence:
+                del live[timer]
+                expired.append(timer)
+
+        return expired
+
+
+
+    def next_deadline(self) -> float | None:
+        """
+        Returns the earliest scheduled deadline, else None.
+        """
+
+        heap = self._heap
+        live = self._live
+
+        while heap and live.get(heap[0][2]) != heap[0][1]:
+            heapq.heappop(heap)
+
+        return heap[0][0] if heap else None
+
+
+
+    def clone(self) -> "HeapScheduler":
+        """
+        Returns a new empty scheduler with the same settings.
+        """
+
+        return HeapScheduler()
+
+
+
+    def __len__(self) -> int:
+
+        return len(self._live)
+
+
+
+    def __repr__(self) -> str:
+
+        return f"<HeapScheduler scheduled={len(self._live)} entries={len(self._heap)}>"
+
+
+
+
+
+class TimingWheelScheduler:
+
+    def __init__(self, resolution:float=0.001, slot_bits:int=8, levels:int=4):
+        """
+        Hierarchical timing wheel. O(1) schedule and cancel, timers with long durations start in coarse levels and
+        cascade down as they approach. Deadlines are rounded up to the resolution, so timers never expire early.
+
+        resolution : seconds per tick of the finest level
+        slot_bits : log2 of the number of slots per level
+        levels : number of levels, the wheel spans resolution * 2 ** (slot_bits * levels) seconds
+        """
+
+        self.resolution = resolution
+
+        self._bits = slot_bits
+        self._size = 1 << slot_bits
+        self._mask = self._size - 1
+        self._span = 1 << (slot_bits * levels)
+
+        self._wheels = [[{} for _ in range(self._size)] for _ in range(levels)]
+
+        # timers already due when scheduled, and timers further away than the wheel spans
+        self._due = {}
+        self._overflow = {}
+
+        # timer : slot dict holding it, for O(1) cancel
+        self._slots = {}
+
+        self._tick = 0
+
+
+
+    def _ticks(self, current:float) -> int:
+
+        return math.floor(current / self.resolution)
+
+
+
+    def schedule(self, timer:object, deadline:float, current:float) -> None:
+        """
+        Schedules a timer, replacing its previous deadline if it had one.
+
+        timer : timer to schedule
+        deadline : clock time the timer expires at
+        current : current clock time
+        """
+
+        slot = self._slots.pop(timer, None)
+
+        if slot is not None:
+            del slot[timer]
+
+        # an empty wheel has nothing to advance, so it starts again from the current time
+        if not self._slots:
+            self._tick = self._ticks(current)
+
+        self._insert(timer, deadline)
+
+
+
+    def _insert(self, timer:object, deadline:float) -> None:
+
+        expires = math.ceil(deadline / self.resolution)
+        delta = expires - self._tick
+
+        if delta <= 0:
+            slot = self._due
+        elif delta >= self._span:
+            slot = self._overflow
+        else:
+            level = 0
+            limit = self._size
+
+            while delta >= limit:
+                level += 1
+                limit <<= self._bits
+
+            slot = self._wheels[level][(expires >> (self._bits * level)) & self._mask]
+
+        slot[timer] = deadline
+        self._slots[timer] = slot
+
+
+
+    def cancel(self, timer:object) -> None:
+        """
+        Unschedules a timer.
+
+        timer : timer to cancel
+        """
+
+        slot = self._slots.pop(timer, None)
+
+        if slot is not None:
+            del slot[timer]
+
+
+
+    def pop_expired(self, current:float) -> list:
+        """
+        Advances the wheel to current and returns all timers that expired on the way.
+
+        current : current clock time
+        """
+
+        target = self._ticks(current)
+
+        slots = self._slots
+
+        if not slots:
+            self._tick = target
+            return _NO_TIMERS
+
+        expired = []
+
+        wheels = self._wheels
+        level_zero = wheels[0]
+        mask = self._mask
+
+        while self._tick < target and slots:
+            tick = self._tick + 1
+
+            # empty stretches are jumped over, so catching up costs per occupied slot, not per elapsed tick
+            if tick & mask and not level_zero[tick & mask]:
+                tick = self._next_event_tick()
+
+            if tick > target:
+                self._tick = target
+                break
+
+            self._tick = tick
+            index = tick & mask
+
+            if index == 0:
+                self._cascade(1)
+
+            slot = level_zero[index]
+
+            if slot:
+                for timer in slot:
+                    del slots[timer]
+
+                expired.extend(slot.keys())
+                slot.clear()
+
+        # scheduled already due, or cascaded onto the tick just processed
+        if self._due:
+            for timer in self._due:
+                del slots[timer]
+
+            expired.extend(self._due.keys())
+            self._due.clear()
+
+        if not slots:
+            self._tick = target
+
+        return expired
+
+
+
+    def _next_event_tick(self) -> int:
+
+        # first tick after _tick that expires a level 0 slot or cascades an occupied slot. Levels below the first
+        # occupied one are empty, so nothing happens before its next occupied slot in this revolution, or else
+        # before its next revolution starts, where the level above cascades
+        tick = self._tick
+        bits = self._bits
+        mask = self._mask
+
+        for level, wheel in enumerate(self._wheels):
+            shift = bits * level
+            position = tick >> shift
+            index = position & mask
+
+            for next_index in range(index + 1, self._size):
+                if wheel[next_index]:
+                    return (position - index + next_index) << shift
+
+            if any(wheel):
+                return (position - index + self._size) << shift
+
+        # only overflow timers, which are reinserted when the top level wraps
+        shift = bits * len(self._wheels)
+
+        return ((tick >> shift) + 1) << shift
+
+
+
+    def _cascade(self, level:int) -> None:
+
+        # the top level wrapped, overflow timers may now fit in the wheel
+        if level == len(self._wheels):
+            if self._overflow:
+                entries = list(self._overflow.items())
+                self._overflow.clear()
+
+                for timer, deadline in entries:
+                    self._insert(timer, deadline)
+
+            return
+
+        index = (self._tick >> (self._bits * level)) & self._mask
+
+        if index == 0:
+            self._cascade(level + 1)
+
+        slot = self._wheels[level][index]
+
+        if slot:
+            entries = list(slot.items())
+            slot.clear()
+
+            for timer, deadline in entries:
+                self._insert(timer, deadline)
+
+
+
+    def next_deadline(self) -> float | None:
+        """
+        Returns the earliest scheduled deadline, else None. Scans at most one occupied slot per level and the overflow.
+        """
+
+        if self._due:
+            return min(self._due.values())
+
+        earliest = min(self._overflow.values()) if self._overflow else None
+
+        for level, wheel in enumerate(self._wheels):
+            start = (self._tick >> (self._bits * level)) & self._mask
+
+            # the current slot of every level only holds timers a full revolution away, so it is checked last
+            for offset in range(1, self._size + 1):
+                slot = wheel[(start + offset) & self._mask]
+
+                if slot:
+                    deadline = min(slot.values())
+
+                    if earliest is None or deadline < earliest:
+                        earliest = deadline
+
+                    break
+
+        return earliest
+
+
+
+    def clone(self) -> "TimingWheelScheduler":
+        """
+        Returns a new empty wheel with the same resolution, slot count and number of levels.
+        """
+
+        return TimingWheelScheduler(self.resolution, self._bits, len(self._wheels))
+
+
+
+    def __len__(self) -> int:
+
+        return len(self._slots)
+
+
+
+    def __repr__(self) -> str:
+
+        return f"<TimingWheelScheduler scheduled={len(self._slots)} resolution={self.resolution}>"
\ No newline at end of file